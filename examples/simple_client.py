@@ -4,26 +4,75 @@ Simple WhatsApp client example using nocksup.
 
 This example demonstrates how to use the nocksup library
 to create a simple WhatsApp client for sending and receiving messages.
+
+Install the package in development mode before running it:
+
+    pip install -e .
 """
-import os
-import sys
-import time
+import argparse
 import logging
-from getpass import getpass
-
-# Add parent directory to path to allow importing nocksup
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from nocksup import NocksupClient
-from nocksup.exceptions import (
-    ConnectionError, 
-    AuthenticationError, 
-    MessageError,
-    ValidationError
+from nocksup.exceptions import AuthenticationError
+
+logger = logging.getLogger('simple_client')
+
+def _do_register(client):
+    """Register the phone number and connect with the new credentials."""
+    method = input("Verification method (sms/voice): ").lower() or 'sms'
+    client.register_number(method=method)
+    print(f"Verification code sent via {method}")
+    
+    # Verify code
+    code = input("Enter verification code: ")
+    client.verify_code(code)
+    print("Verification successful")
+    
+    # Now connect
+    client.connect(restore_session=False)
+    print("Connected with new registration")
+
+def _do_qr(client):
+    """Connect using QR code authentication."""
+    print("Connecting with QR code authentication...")
+    client.connect(restore_session=False, auth_method="qr")
+    print("Please scan the QR code with your WhatsApp mobile app")
+    print("Go to WhatsApp Settings > Linked Devices > Link a device")
+
+def _do_pairing(client):
+    """Connect using pairing code authentication."""
+    print("Connecting with pairing code authentication...")
+    pairing_code = input("Enter the 8-digit pairing code from your WhatsApp mobile app: ")
+    print("To get a pairing code, open WhatsApp on your phone")
+    print("Go to Settings > Linked Devices > Link a device > Can't scan QR code?")
+    client.connect(restore_session=False, auth_method="pairing_code", pairing_code=pairing_code)
+    print("Pairing code sent, waiting for authentication confirmation")
+
+_AUTH_PROMPT = (
+    "Choose authentication method:\n"
+    "(r) Register number\n"
+    "(q) QR code authentication\n"
+    "(p) Pairing code authentication\n"
+    "Enter choice (r/q/p): "
 )
 
+_AUTH_ACTIONS = {
+    'r': _do_register,
+    'q': _do_qr,
+    'p': _do_pairing
+}
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Simple WhatsApp client example")
+    parser.add_argument('--echo', action='store_true',
+                        help="reply to every received text message with its content")
+    return parser.parse_args()
+
 def main():
     """Run the simple WhatsApp client example."""
+    args = parse_args()
+    
     # Configure logging
     logging.basicConfig(
         level=logging.INFO,
@@ -48,62 +97,37 @@ def main():
         except AuthenticationError:
             print("No valid session found, need to register or authenticate")
             
-            auth_choices = ["r", "q", "p"]
-            auth_choice = ""
-            while auth_choice not in auth_choices:
-                auth_choice = input(
-                    "Choose authentication method:\n"
-                    "(r) Register number\n"
-                    "(q) QR code authentication\n"
-                    "(p) Pairing code authentication\n"
-                    "Enter choice (r/q/p): "
-                ).lower()
-            
-            if auth_choice == "r":
-                # Register number
-                method = input("Verification method (sms/voice): ").lower() or 'sms'
-                response = client.register_number(method=method)
-                print(f"Verification code sent via {method}")
-                
-                # Verify code
-                code = input("Enter verification code: ")
-                client.verify_code(code)
-                print("Verification successful")
-                
-                # Now connect
-                client.connect(restore_session=False)
-                print("Connected with new registration")
-            
-            elif auth_choice == "q":
-                print("Connecting with QR code authentication...")
-                client.connect(restore_session=False, auth_method="qr")
-                print("Please scan the QR code with your WhatsApp mobile app")
-                print("Go to WhatsApp Settings > Linked Devices > Link a device")
-            
-            elif auth_choice == "p":
-                print("Connecting with pairing code authentication...")
-                pairing_code = input("Enter the 8-digit pairing code from your WhatsApp mobile app: ")
-                print("To get a pairing code, open WhatsApp on your phone")
-                print("Go to Settings > Linked Devices > Link a device > Can't scan QR code?")
-                client.connect(restore_session=False, auth_method="pairing_code", pairing_code=pairing_code)
-                print("Pairing code sent, waiting for authentication confirmation")
-            
-            else:
-                print("To use the library, you need to authenticate first")
-                sys.exit(1)
+            action = None
+            while action is None:
+                action = _AUTH_ACTIONS.get(input(_AUTH_PROMPT).strip().lower())
+            action(client)
         
         # Set up message handler
+        def log_text(message):
+            logger.info("New message from %s type=%s content=%r",
+                        message.get('from'), message.get('type'), message.get('content'))
+            
+            if args.echo:
+                try:
+                    client.send_text_message(message.get('from'), f"Echo: {message.get('content')}")
+                except Exception as e:
+                    logger.error("Failed to echo message: %s", e)
+        
+        def log_media(message):
+            logger.info("New message from %s type=%s media_type=%s caption=%r",
+                        message.get('from'), message.get('type'),
+                        message.get('media_type'), message.get('caption'))
+        
+        # Look up the log formatter by type instead of chaining if/elif
+        loggers = {
+            'text': log_text,
+            'media': log_media
+        }
+        
         def on_message(message):
-            print("\nNew message received:")
-            if message.get('type') == 'text':
-                print(f"From: {message.get('from')}")
-                print(f"Content: {message.get('content')}")
-                print()
-            elif message.get('type') == 'media':
-                print(f"From: {message.get('from')}")
-                print(f"Media type: {message.get('media_type')}")
-                print(f"Caption: {message.get('caption')}")
-                print()
+            log_message = loggers.get(message.get('type'))
+            if log_message:
+                log_message(message)
         
         # Register message handler
         client.on_message(on_message)
@@ -146,7 +170,7 @@ def main():
                 # Create group
                 subject = input("Enter group name: ")
                 participants_input = input("Enter participant phone numbers (comma-separated): ")
-                participants = [p.strip() for p in participants_input.split(',')]
+                participants = list(map(str.strip, participants_input.split(',')))
                 
                 try:
                     group_info = client.create_group(subject, participants)
@@ -156,17 +180,19 @@ def main():
                 
             elif choice == '4':
                 # Get contact info
-                phone = input("Enter contact phone number: ")
+                phones_input = input("Enter contact phone numbers (comma-separated): ")
+                phones = list(map(str.strip, phones_input.split(',')))
                 
                 try:
-                    contact_info = client.get_contact(phone)
-                    print("\nContact Information:")
-                    print(f"Name: {contact_info.get('name', 'Unknown')}")
-                    print(f"Phone: {contact_info.get('phone')}")
-                    print(f"Status: {contact_info.get('status', 'No status')}")
-                    print(f"WhatsApp User: {contact_info.get('is_whatsapp_user', False)}")
+                    # One lookup for all requested numbers
+                    for contact_info in client.get_contacts(phones):
+                        print("\nContact Information:")
+                        print(f"Name: {contact_info.get('name', 'Unknown')}")
+                        print(f"Phone: {contact_info.get('phone')}")
+                        print(f"Status: {contact_info.get('status', 'No status')}")
+                        print(f"WhatsApp User: {contact_info.get('is_whatsapp_user', False)}")
                 except Exception as e:
-                    print(f"Failed to get contact: {e}")
+                    print(f"Failed to get contacts: {e}")
                 
             elif choice == '5':
                 # Disconnect and exit
@@ -178,8 +204,10 @@ def main():
             else:
                 print("Invalid choice, please try again")
             
-            # Small delay before showing menu again
-            time.sleep(1)
+            # Stop if the connection was lost and could not be restored
+            if client.wait_for_disconnect(timeout=0):
+                print("Connection to WhatsApp lost. Goodbye!")
+                break
             
     except KeyboardInterrupt:
         print("\nInterrupted by user")
@@ -10,10 +10,30 @@ Main components:
 - Contact and group management
 - Connection management
 """
+import importlib
 
 __version__ = '0.2.0'
 
-# For more convenient imports
-from nocksup.client.client import NocksupClient
+# Public names and the modules defining them. They are imported on first
+# access so that `import nocksup` does not load the whole client stack.
+_LAZY_IMPORTS = {
+    'NocksupClient': 'nocksup.client.client',
+}
 
-__all__ = ['NocksupClient']
\ No newline at end of file
+__all__ = ['NocksupClient']
+
+def __getattr__(name):
+    """Import public names lazily on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List module attributes including lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -4,8 +4,28 @@ Authentication module for WhatsApp connection.
 This module provides the necessary authentication functions for 
 establishing a secure WhatsApp connection.
 """
+import importlib
 
-from nocksup.auth.authentication import Authenticator
-from nocksup.auth.registration import Registration
+# Public names and the modules defining them, imported on first access
+_LAZY_IMPORTS = {
+    'Authenticator': 'nocksup.auth.authentication',
+    'Registration': 'nocksup.auth.registration',
+}
 
 __all__ = ['Authenticator', 'Registration']
+
+def __getattr__(name):
+    """Import public names lazily on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List module attributes including lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
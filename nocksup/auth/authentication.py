@@ -5,11 +5,10 @@ This module handles WhatsApp authentication, session management,
 and login functionality.
 """
 import base64
-import hashlib
-import hmac
-import json
+import select
+import ssl
 import time
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Callable
 
 # Make sure websocket-client is installed
 try:
@@ -18,11 +17,34 @@ except ImportError:
     raise ImportError("websocket-client package is required. Install it using 'pip install websocket-client'.")
 
 from nocksup.utils.encryption import EncryptionManager, generate_random_bytes
-from nocksup.utils.http_utils import HttpClient
+from nocksup.utils.http_utils import HttpClient, get_shared_http_client
 from nocksup.utils.logger import logger
+from nocksup.utils import json_utils
+from nocksup.utils.ssl_utils import get_shared_ssl_context
 from nocksup.exceptions import AuthenticationError
 from nocksup.storage.session_store import SessionStore
-from nocksup.protocols.constants import WHATSAPP_WEB_VERSION
+from nocksup.protocols.constants import WEBSOCKET_URL
+from nocksup.config import SESSION_CACHE_TTL
+
+# Connection headers with updated browser info.
+# permessage-deflate is not offered: websocket-client cannot
+# decompress frames, and rejects any frame with RSV1 set
+_WS_HEADERS = {
+    "Origin": "https://web.whatsapp.com",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Sec-WebSocket-Version": "13",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+}
+
+# Restore message field -> stored credential key
+_RESTORE_FIELDS = (
+    ("clientId", "client_id"),
+    ("clientToken", "client_token"),
+    ("serverToken", "server_token"),
+    ("browserToken", "browser_token"),
+    ("phoneId", "phone_id"),
+)
 
 class Authenticator:
     """
@@ -32,8 +54,14 @@ class Authenticator:
     QR authentication and reconnection with existing sessions.
     """
     
+    __slots__ = (
+        'phone_number', 'session_store', 'encryption_manager', 'http_client',
+        'ws', 'connected', 'credentials', '_credentials_time'
+    )
+    
     def __init__(self, phone_number: str, session_store: SessionStore, 
-                 encryption_manager: EncryptionManager = None):
+                 encryption_manager: EncryptionManager = None,
+                 http_client: HttpClient = None):
         """
         Initialize authenticator.
         
@@ -41,14 +69,16 @@ class Authenticator:
             phone_number: User's phone number with country code
             session_store: Storage for session data
             encryption_manager: Optional encryption manager
+            http_client: Optional HTTP client to use
         """
         self.phone_number = phone_number
         self.session_store = session_store
         self.encryption_manager = encryption_manager or EncryptionManager()
-        self.http_client = HttpClient()
+        self.http_client = http_client or get_shared_http_client()
         self.ws = None
         self.connected = False
         self.credentials = None
+        self._credentials_time = 0.0
         
     def connect(self, restore_session: bool = True, auth_method: str = 'qr', pairing_code: str = None) -> bool:
         """
@@ -67,7 +97,7 @@ class Authenticator:
         """
         # Try to restore session if requested
         if restore_session:
-            self.credentials = self.session_store.load_session(self.phone_number)
+            self._load_credentials()
             if self.credentials:
                 logger.info("Attempting to restore previous session")
                 try:
@@ -79,6 +109,40 @@ class Authenticator:
         # Fresh login with specified authentication method
         return self._login(auth_method=auth_method, pairing_code=pairing_code)
     
+    def resume_session(self) -> bool:
+        """
+        Restore the current session after a dropped connection.
+        
+        Unlike connect(), this never falls back to a fresh login, and it
+        reuses the credentials already in memory instead of reading the
+        session store again, unless they are older than SESSION_CACHE_TTL.
+        
+        Returns:
+            True if the session was restored
+            
+        Raises:
+            AuthenticationError: If there is no session or it can't be restored
+        """
+        if (not self.credentials or
+                time.monotonic() - self._credentials_time > SESSION_CACHE_TTL):
+            self._load_credentials()
+            if not self.credentials:
+                raise AuthenticationError("No session to resume")
+        
+        logger.info("Resuming session")
+        try:
+            return self._restore_session()
+        except AuthenticationError:
+            # Don't retry with rejected credentials; the next attempt
+            # reads the session store again
+            self.credentials = None
+            raise
+    
+    def _load_credentials(self) -> None:
+        """Load the stored session credentials into memory."""
+        self.credentials = self.session_store.load_session(self.phone_number)
+        self._credentials_time = time.monotonic()
+    
     def _login(self, auth_method: str = 'qr', pairing_code: str = None) -> bool:
         """
         Perform fresh login process.
@@ -153,16 +217,12 @@ class Authenticator:
             self._init_websocket()
             
             # Send session restore message
-            restore_message = {
-                "clientId": self.credentials.get("client_id"),
-                "clientToken": self.credentials.get("client_token"),
-                "serverToken": self.credentials.get("server_token"),
-                "browserToken": self.credentials.get("browser_token"),
-                "phoneId": self.credentials.get("phone_id"),
-                "loginTime": int(time.time() * 1000)
-            }
+            restore_message = dict(
+                self._get_restore_fields(),
+                loginTime=int(time.time() * 1000)
+            )
             
-            self.ws.send(json.dumps(restore_message))
+            self.ws.send(json_utils.dumpb(restore_message))
             
             # Wait for restore response
             success = self._wait_for_restore()
@@ -177,6 +237,21 @@ class Authenticator:
             logger.error(f"WebSocket connection error during restore: {e}")
             raise AuthenticationError(f"Failed to restore session: {str(e)}")
     
+    def _get_restore_fields(self) -> Dict[str, Any]:
+        """
+        Get the credential fields of the restore message.
+        
+        Built from the current credentials on every call, so updated
+        tokens are always sent.
+        
+        Returns:
+            Restore message fields without the login time
+        """
+        return {
+            field: self.credentials.get(key)
+            for field, key in _RESTORE_FIELDS
+        }
+    
     def _init_websocket(self) -> None:
         """
         Initialize WebSocket connection to WhatsApp servers.
@@ -185,25 +260,12 @@ class Authenticator:
             AuthenticationError: If connection fails
         """
         try:
-            # Connect to WhatsApp WebSocket server using updated URL for current protocol
-            # Use /ws/chat endpoint for current WhatsApp Web
-            ws_url = "wss://web.whatsapp.com/ws/chat"
-            
-            # Connection headers with updated browser info
-            headers = {
-                "Origin": "https://web.whatsapp.com",
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-                "Sec-WebSocket-Extensions": "permessage-deflate; client_max_window_bits",
-                "Sec-WebSocket-Version": "13",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept-Encoding": "gzip, deflate, br",
-            }
-            
-            # Create WebSocket connection with updated parameters
+            # Create WebSocket connection to the /ws/chat endpoint used by current WhatsApp Web
             self.ws = websocket.create_connection(
-                ws_url, 
-                header=headers,
+                WEBSOCKET_URL,
+                header=_WS_HEADERS,
                 enable_multithread=True,
+                sslopt={'context': get_shared_ssl_context()},
                 timeout=30
             )
             logger.info("WebSocket connection established")
@@ -226,19 +288,18 @@ class Authenticator:
         # Generate keys for authentication
         keys = self.encryption_manager.generate_keys()
         
-        # Create a QR string with the essential components
-        qr_components = [
-            self.phone_number,
-            base64.b64encode(client_token).decode('utf-8'),
-            client_id,
-            base64.b64encode(keys['identity_public']).decode('utf-8')
-        ]
+        # Join the essential components as bytes; QR encoders take bytes directly
+        qr_bytes = b",".join([
+            self.phone_number.encode('ascii'),
+            base64.b64encode(client_token),
+            client_id.encode('ascii'),
+            base64.b64encode(keys['identity_public'])
+        ])
         
-        qr_string = ",".join(qr_components)
-        
-        # This QR string would be encoded as a QR code for the user to scan
+        # This QR payload would be encoded as a QR code for the user to scan
         qr_data = {
-            "qr_string": qr_string,
+            "qr_bytes": qr_bytes,
+            "qr_string": qr_bytes.decode('ascii'),
             "client_id": client_id,
             "client_token": client_token,
             "keys": keys
@@ -284,7 +345,7 @@ class Authenticator:
         # In a real implementation, this would be sent to the WebSocket
         # Here we just prepare it and simulate sending
         if self.ws:
-            self.ws.send(json.dumps(pairing_request))
+            self.ws.send(json_utils.dumpb(pairing_request))
             logger.info(f"Pairing code request sent for number {self.phone_number}")
         else:
             raise AuthenticationError("WebSocket connection not established")
@@ -299,6 +360,78 @@ class Authenticator:
         
         return pairing_info
     
+    def _recv_until(self, deadline: float, predicate: Callable[[Dict[str, Any]], bool],
+                    marker: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Block on the WebSocket until a message matches or the deadline passes.
+        
+        Readiness is checked with select() on the underlying socket, so the
+        thread sleeps in the kernel until data arrives or time runs out.
+        The socket timeout is still set to the remaining time as a guard
+        against frames that arrive only partially.
+        
+        Args:
+            deadline: Absolute time.monotonic() value to stop waiting at
+            predicate: Returns True for the message being waited for
+            marker: Substring every matching frame must contain; frames
+                without it are skipped without being parsed
+            
+        Returns:
+            The first matching message, or None on timeout
+            
+        Raises:
+            websocket.WebSocketException: If the connection fails
+        """
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            
+            if not self._wait_readable(remaining):
+                return None
+            
+            self.ws.settimeout(max(deadline - time.monotonic(), 0.001))
+            try:
+                message = self.ws.recv()
+            except websocket.WebSocketTimeoutException:
+                return None
+            
+            # Cheap checks first: only JSON objects with the marker can match
+            if isinstance(message, bytes):
+                if message[:1] != b'{' or (marker and marker.encode('ascii') not in message):
+                    continue
+            elif message[:1] != '{' or (marker and marker not in message):
+                continue
+            
+            # Parse the message, skipping anything that isn't JSON
+            try:
+                data = json_utils.loads(message)
+            except ValueError:
+                logger.debug("Ignoring non-JSON message while waiting")
+                continue
+            
+            if isinstance(data, dict) and predicate(data):
+                return data
+    
+    def _wait_readable(self, timeout: float) -> bool:
+        """
+        Wait until the WebSocket has data to read.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            True if data is available, False on timeout
+        """
+        sock = self.ws.sock
+        
+        # TLS may already hold decrypted bytes that select() can't see
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+        
+        readable, _, _ = select.select([sock], [], [], timeout)
+        return bool(readable)
+    
     def _wait_for_auth(self) -> bool:
         """
         Wait for authentication confirmation.
@@ -306,49 +439,32 @@ class Authenticator:
         Returns:
             True if authenticated successfully
         """
-        # In a real implementation, this would listen for WebSocket messages
-        # and process them according to WhatsApp's protocol
-        
-        # For this sample implementation, we'll simulate a success response
-        # after a timeout to represent a user scanning the QR code
-        
         # Timeout after 60 seconds
-        timeout = time.time() + 60
+        deadline = time.monotonic() + 60
         
         try:
-            while time.time() < timeout:
-                # Check for messages with a short timeout
-                self.ws.settimeout(1)
-                try:
-                    message = self.ws.recv()
-                    
-                    # Parse the message
-                    data = json.loads(message)
-                    
-                    # Check if it's an authentication confirmation
-                    if data.get("status") == "connected":
-                        # Store credentials from response
-                        self.credentials = {
-                            "client_id": data.get("clientId"),
-                            "client_token": data.get("clientToken"),
-                            "server_token": data.get("serverToken"),
-                            "browser_token": data.get("browserToken"),
-                            "phone_id": data.get("phoneId"),
-                            "secret": data.get("secret"),
-                            "public_key": data.get("publicKey"),
-                            "private_key": data.get("privateKey"),
-                        }
-                        
-                        logger.info("Authentication successful")
-                        return True
-                        
-                except websocket.WebSocketTimeoutException:
-                    # No message received within timeout, continue waiting
-                    pass
-                    
-            # Timeout elapsed without successful authentication
-            logger.warning("Authentication timeout")
-            return False
+            data = self._recv_until(deadline, lambda d: d.get("status") == "connected", "connected")
+            
+            if data is None:
+                # Timeout elapsed without successful authentication
+                logger.warning("Authentication timeout")
+                return False
+            
+            # Store credentials from response
+            self._credentials_time = time.monotonic()
+            self.credentials = {
+                "client_id": data.get("clientId"),
+                "client_token": data.get("clientToken"),
+                "server_token": data.get("serverToken"),
+                "browser_token": data.get("browserToken"),
+                "phone_id": data.get("phoneId"),
+                "secret": data.get("secret"),
+                "public_key": data.get("publicKey"),
+                "private_key": data.get("privateKey"),
+            }
+            
+            logger.info("Authentication successful")
+            return True
             
         except websocket.WebSocketException as e:
             logger.error(f"WebSocket error during authentication: {e}")
@@ -361,33 +477,19 @@ class Authenticator:
         Returns:
             True if session restored successfully
         """
-        # Similar to _wait_for_auth, but for session restore
-        
         # Timeout after 30 seconds
-        timeout = time.time() + 30
+        deadline = time.monotonic() + 30
         
         try:
-            while time.time() < timeout:
-                # Check for messages with a short timeout
-                self.ws.settimeout(1)
-                try:
-                    message = self.ws.recv()
-                    
-                    # Parse the message
-                    data = json.loads(message)
-                    
-                    # Check if it's a restore confirmation
-                    if data.get("status") == "connected":
-                        logger.info("Session restored successfully")
-                        return True
-                        
-                except websocket.WebSocketTimeoutException:
-                    # No message received within timeout, continue waiting
-                    pass
-                    
-            # Timeout elapsed without successful restore
-            logger.warning("Session restore timeout")
-            return False
+            data = self._recv_until(deadline, lambda d: d.get("status") == "connected", "connected")
+            
+            if data is None:
+                # Timeout elapsed without successful restore
+                logger.warning("Session restore timeout")
+                return False
+            
+            logger.info("Session restored successfully")
+            return True
             
         except websocket.WebSocketException as e:
             logger.error(f"WebSocket error during session restore: {e}")
@@ -7,23 +7,41 @@ with WhatsApp servers.
 import base64
 import hashlib
 import hmac
-import json
 import os
-import random
-import time
-from typing import Dict, Any, Optional, Tuple
+import secrets
+from typing import Dict, Any
 
-from nocksup.utils.http_utils import HttpClient
+from nocksup.utils.http_utils import HttpClient, get_shared_http_client
 from nocksup.utils.logger import logger
 from nocksup.utils import validate_phone_number
 from nocksup.exceptions import RegistrationError, VerificationError
 from nocksup.config import (
     WHATSAPP_REGISTER_URL,
     WHATSAPP_VERIFY_URL,
-    WHATSAPP_VERSION,
-    USER_AGENT
+    WHATSAPP_VERSION
 )
 
+# Keyed HMAC for registration tokens; copied per token so the key schedule runs once
+_TOKEN_KEY = b"WhatsApp Token Generation"
+_TOKEN_TEMPLATE = hmac.new(_TOKEN_KEY, b"", hashlib.sha256)
+
+# Calling code -> ISO country code. Calling codes are prefix-free, so at most
+# one of the 1-, 2- and 3-digit prefixes of a number can match
+_CC_MAP = {
+    '1': 'US', '7': 'RU', '20': 'EG', '27': 'ZA', '30': 'GR', '31': 'NL',
+    '32': 'BE', '33': 'FR', '34': 'ES', '36': 'HU', '39': 'IT', '40': 'RO',
+    '41': 'CH', '43': 'AT', '44': 'GB', '45': 'DK', '46': 'SE', '47': 'NO',
+    '48': 'PL', '49': 'DE', '51': 'PE', '52': 'MX', '53': 'CU', '54': 'AR',
+    '55': 'BR', '56': 'CL', '57': 'CO', '58': 'VE', '60': 'MY', '61': 'AU',
+    '62': 'ID', '63': 'PH', '64': 'NZ', '65': 'SG', '66': 'TH', '81': 'JP',
+    '82': 'KR', '84': 'VN', '86': 'CN', '90': 'TR', '91': 'IN', '92': 'PK',
+    '93': 'AF', '94': 'LK', '95': 'MM', '98': 'IR', '212': 'MA', '213': 'DZ',
+    '216': 'TN', '234': 'NG', '254': 'KE', '351': 'PT', '353': 'IE', '358': 'FI',
+    '359': 'BG', '370': 'LT', '371': 'LV', '372': 'EE', '373': 'MD', '380': 'UA',
+    '381': 'RS', '385': 'HR', '420': 'CZ', '421': 'SK', '880': 'BD', '966': 'SA',
+    '971': 'AE', '972': 'IL',
+}
+
 class Registration:
     """
     WhatsApp registration manager.
@@ -31,6 +49,24 @@ class Registration:
     Handles phone number registration and verification with WhatsApp servers.
     """
     
+    __slots__ = ('http_client',)
+    
+    # Registration parameters that are the same for every request
+    _PARAMS_TEMPLATE = {
+        'rc': 0,  # Retry count
+        'lg': 'en',  # Language
+        'lc': 'US',  # Locale
+        'mistyped': '6',  # Mistyped count (default)
+        'network_radio_type': '1',  # Network radio type (default)
+        'simnum': '1',  # SIM number (default)
+        'hasinrc': '1',  # Has in recent calls (default)
+        'tos': '2',  # Terms of service version
+        'e_keytype': '1',  # Key type (default)
+        'cpm': '0',  # Contacts permission (default)
+        'nbh': '0',  # Nearby share (default)
+        'v': WHATSAPP_VERSION,
+    }
+    
     def __init__(self, http_client: HttpClient = None):
         """
         Initialize registration manager.
@@ -38,7 +74,7 @@ class Registration:
         Args:
             http_client: Optional HTTP client to use
         """
-        self.http_client = http_client or HttpClient()
+        self.http_client = http_client or get_shared_http_client()
         
     def request_code(self, phone_number: str, method: str = 'sms', 
                     language: str = 'en', country_code: str = None) -> Dict[str, Any]:
@@ -60,9 +96,9 @@ class Registration:
         # Validate phone number
         phone = validate_phone_number(phone_number)
         
-        # Extract country code if not provided
-        if not country_code and phone.startswith('1'):
-            country_code = 'US'  # Default to US for country code 1
+        # Extract country code from the calling code prefix if not provided
+        if not country_code:
+            country_code = _CC_MAP.get(phone[:1]) or _CC_MAP.get(phone[:2]) or _CC_MAP.get(phone[:3])
         
         # Generate registration parameters
         params = self._generate_registration_params(phone)
@@ -152,40 +188,34 @@ class Registration:
         # Generate device ID
         device_id = self._generate_device_id()
         
-        # Current timestamp
-        timestamp = int(time.time())
+        # Encode and hash the phone number once; per-key hashes extend copies of it.
+        # refkey/authkey are opaque client nonces, so the faster BLAKE2b is used
+        phone_bytes = phone.encode('ascii')
+        phone_hash = hashlib.blake2b(phone_bytes, digest_size=32)
+        
+        # Read all the randomness needed below with a single syscall
+        entropy = os.urandom(52)
         
         # Generate a random client_static_keypair
-        client_static_keypair = base64.b64encode(os.urandom(32)).decode('utf-8')
+        client_static_keypair = base64.b64encode(entropy[:32]).decode('utf-8')
         
-        # Base parameters
+        # Constant fields come from the template; only per-request values are added.
+        # NOTE: all e_* key fields currently share one random value
         params = {
+            **self._PARAMS_TEMPLATE,
             'cc': phone[:3],  # Country code
             'in': phone[3:],  # Phone number without country code
-            'rc': 0,  # Retry count
             'id': device_id,
-            'lg': 'en',  # Language
-            'lc': 'US',  # Locale
-            'token': self._generate_token(phone),
-            'mistyped': '6',  # Mistyped count (default)
-            'network_radio_type': '1',  # Network radio type (default)
-            'simnum': '1',  # SIM number (default)
-            'hasinrc': '1',  # Has in recent calls (default)
-            'tos': '2',  # Terms of service version
             'fdid': device_id,  # Facebook device ID
-            'refkey': self._generate_ref_key(phone),
+            'token': self._generate_token(phone_bytes),
+            'refkey': self._generate_random_key(phone_hash, entropy[32:42]),
+            'authkey': self._generate_random_key(phone_hash, entropy[42:52]),
+            'expid': self._generate_exp_id(),
             'e_regid': client_static_keypair,
-            'e_keytype': '1',  # Key type (default)
             'e_ident': client_static_keypair,
             'e_skey_id': client_static_keypair,
             'e_skey_val': client_static_keypair,
             'e_skey_pkey': client_static_keypair,
-            'cpm': '0',  # Contacts permission (default)
-            'nbh': '0',  # Nearby share (default)
-            'authkey': self._generate_auth_key(phone),
-            'expid': self._generate_exp_id(),
-            'fdid': device_id,
-            'v': WHATSAPP_VERSION,
         }
         
         return params
@@ -197,59 +227,41 @@ class Registration:
         Returns:
             Device ID string
         """
-        # Generate a random device ID
-        device_id = ''.join(
-            random.choice('0123456789abcdef') for _ in range(16)
-        )
-        return device_id
+        # Generate a random device ID (16 hex characters)
+        return secrets.token_hex(8)
     
-    def _generate_token(self, phone: str) -> str:
+    def _generate_token(self, phone_bytes: bytes) -> str:
         """
         Generate a token for the registration request.
         
         Args:
-            phone: Phone number
+            phone_bytes: ASCII-encoded phone number
             
         Returns:
             Token string
         """
         # Generate a token based on the phone number
-        data = phone.encode('utf-8')
-        key = "WhatsApp Token Generation".encode('utf-8')
-        
-        # Create HMAC using SHA256
-        token_hmac = hmac.new(key, data, hashlib.sha256)
-        return base64.b64encode(token_hmac.digest()).decode('utf-8')
+        token_hmac = _TOKEN_TEMPLATE.copy()
+        token_hmac.update(phone_bytes)
+        return base64.b64encode(token_hmac.digest()).decode('ascii')
     
-    def _generate_ref_key(self, phone: str) -> str:
+    def _generate_random_key(self, phone_hash: Any, salt: bytes) -> str:
         """
-        Generate a reference key.
+        Generate a random key salted with the phone number.
         
-        Args:
-            phone: Phone number
-            
-        Returns:
-            Reference key string
-        """
-        # Generate a random reference key
-        key_data = phone.encode('utf-8') + os.urandom(10)
-        key_hash = hashlib.sha256(key_data).digest()
-        return base64.b64encode(key_hash).decode('utf-8')
-    
-    def _generate_auth_key(self, phone: str) -> str:
-        """
-        Generate an auth key.
+        Used for both the reference key and the auth key.
         
         Args:
-            phone: Phone number
+            phone_hash: Hash object already fed with the phone number
+            salt: 10 random bytes
             
         Returns:
-            Auth key string
+            Key string
         """
-        # Generate a random auth key
-        key_data = phone.encode('utf-8') + os.urandom(10)
-        key_hash = hashlib.sha256(key_data).digest()
-        return base64.b64encode(key_hash).decode('utf-8')
+        # Extend a copy of the phone prefix hash with the random bytes
+        key_hash = phone_hash.copy()
+        key_hash.update(salt)
+        return base64.b64encode(key_hash.digest()).decode('ascii')
     
     def _generate_exp_id(self) -> str:
         """
@@ -258,8 +270,5 @@ class Registration:
         Returns:
             Experiment ID string
         """
-        # Generate a random experiment ID
-        exp_id = ''.join(
-            random.choice('0123456789abcdef') for _ in range(8)
-        )
-        return exp_id
+        # Generate a random experiment ID (8 hex characters)
+        return secrets.token_hex(4)
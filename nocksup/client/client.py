@@ -5,27 +5,38 @@ This module provides the main client class for interacting with
 WhatsApp, serving as the primary interface for users of the library.
 """
 import os
+import queue
+import random
+import threading
 import time
-from typing import Dict, Any, List, Optional, Callable, Union
+from collections import OrderedDict, deque
+from typing import Dict, Any, BinaryIO, Iterable, List, Optional, Callable, Union, Iterator
 
 from nocksup.utils.logger import logger, setup_logger
 from nocksup.utils import validate_phone_number
+from nocksup.utils.http_utils import HttpClient, get_shared_http_client
 from nocksup.exceptions import (
     ConnectionError, 
     AuthenticationError, 
     MessageError,
     ValidationError
 )
-from nocksup.auth.authentication import Authenticator
-from nocksup.auth.registration import Registration
-from nocksup.protocols.connection import ConnectionManager
 from nocksup.messaging.message import Message, MessageType
-from nocksup.messaging.media import MediaUploader, MediaDownloader
-from nocksup.messaging.group import GroupManager
 from nocksup.client.contact_manager import ContactManager
 from nocksup.storage.session_store import SessionStore
 from nocksup.storage.contact_store import ContactStore
-from nocksup.config import ConfigManager
+from nocksup.config import (
+    ConfigManager,
+    CONTACT_CACHE_TTL,
+    CONTACT_CACHE_SIZE,
+    INBOX_MAX_SIZE,
+    MEDIA_QUEUE_SIZE,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_TIMEOUT
+)
+
+# Contact cache lifetime in monotonic nanoseconds
+_CONTACT_CACHE_TTL_NS = CONTACT_CACHE_TTL * 1000000000
 
 class NocksupClient:
     """
@@ -37,7 +48,8 @@ class NocksupClient:
     """
     
     def __init__(self, phone_number: str = None, config_path: str = None, 
-                 log_level: int = None, log_file: str = None):
+                 log_level: int = None, log_file: str = None,
+                 http_client: HttpClient = None):
         """
         Initialize the WhatsApp client.
         
@@ -46,6 +58,7 @@ class NocksupClient:
             config_path: Path for configuration and data files
             log_level: Logging level
             log_file: Path to log file (if None, logs to console only)
+            http_client: Optional HTTP client shared by all HTTP calls
         """
         # Set up logging
         self.logger = setup_logger('nocksup.client', log_level, log_file)
@@ -62,23 +75,95 @@ class NocksupClient:
         if phone_number:
             self.set_phone_number(phone_number)
         
+        # Single HTTP client so registration, verification and media
+        # requests share one connection pool
+        self.http_client = http_client or get_shared_http_client()
+        
         # Initialize managers (will be fully initialized on connect)
         self.connection = None
         self.authenticator = None
-        self.registration = Registration()
+        self._registration = None
         self.contact_manager = None
         self.group_manager = None
-        self.media_uploader = MediaUploader()
-        self.media_downloader = MediaDownloader()
+        self._media_uploader = None
+        self._media_downloader = None
+        
+        # Message callback registry: one callback for every message, plus
+        # one per chat message subtype ('text', 'image', ...)
+        self._wildcard_callback = None
+        self._type_callbacks = {}
+        self._batch_callback = None
+        
+        # Received messages waiting to be consumed, drained in batches by
+        # messages(); the dispatch thread feeds registered callbacks from it.
+        # Bounded, so a stalled consumer drops the oldest messages instead
+        # of growing without limit
+        self._inbox = deque(maxlen=INBOX_MAX_SIZE)
+        self._inbox_ready = threading.Condition()
+        self._dispatch_thread = None
         
-        # Message callback registry
-        self.message_callbacks = {}
+        # Messages are only buffered once something consumes them; drops
+        # are counted per overflow and reported when the consumer catches up
+        self._inbox_consumed = False
+        self._inbox_dropped = 0
+        
+        # Number of messages() iterators running; callbacks and messages()
+        # can't be used together, since each message goes to only one
+        self._inbox_readers = 0
+        
+        # Media messages queued with wait=False, uploaded and sent in order
+        # by a single worker thread. Bounded, since each entry holds an open
+        # file; senders block while it is full
+        self._media_queue = queue.Queue(maxsize=MEDIA_QUEUE_SIZE)
+        self._media_lock = threading.Lock()
+        self._media_thread = None
+        
+        # Recently looked up contacts: phone -> (expiry in monotonic ns, contact)
+        self._contact_cache = OrderedDict()
+        self._contact_cache_lock = threading.Lock()
         
         # Connection state
         self.connected = False
         
+        # Set whenever the client ends up disconnected, so callers can
+        # block on it instead of polling `connected`
+        self._disconnect_event = threading.Event()
+        self._disconnect_event.set()
+        
+        # Set by disconnect() to cancel a reconnect in progress
+        self._stop_reconnect = threading.Event()
+        
         logger.info("NocksupClient initialized")
     
+    @property
+    def registration(self):
+        """
+        Registration manager, created on first use.
+        
+        Clients that restore a session never register, so the
+        registration module is only imported when it is needed.
+        """
+        if self._registration is None:
+            from nocksup.auth.registration import Registration
+            self._registration = Registration(self.http_client)
+        return self._registration
+    
+    @property
+    def media_uploader(self):
+        """Media uploader, created on the first media send."""
+        if self._media_uploader is None:
+            from nocksup.messaging.media import MediaUploader
+            self._media_uploader = MediaUploader(self.http_client)
+        return self._media_uploader
+    
+    @property
+    def media_downloader(self):
+        """Media downloader, created on the first download."""
+        if self._media_downloader is None:
+            from nocksup.messaging.media import MediaDownloader
+            self._media_downloader = MediaDownloader(self.http_client)
+        return self._media_downloader
+    
     def set_phone_number(self, phone_number: str) -> None:
         """
         Set the user's phone number.
@@ -90,7 +175,7 @@ class NocksupClient:
             ValidationError: If phone number is invalid
         """
         self.phone_number = validate_phone_number(phone_number)
-        logger.info(f"Phone number set: {self.phone_number}")
+        logger.info("Phone number set: %s", self.phone_number)
     
     def connect(self, restore_session: bool = True, auth_method: str = 'qr', pairing_code: str = None) -> bool:
         """
@@ -112,6 +197,14 @@ class NocksupClient:
         if not self.phone_number:
             raise ValidationError("Phone number not set")
         
+        self._stop_reconnect.clear()
+        
+        # Imported here so that creating a client does not load the
+        # websocket and crypto stacks until it actually connects
+        from nocksup.auth.authentication import Authenticator
+        from nocksup.protocols.connection import ConnectionManager
+        from nocksup.messaging.group import GroupManager
+        
         try:
             logger.info("Connecting to WhatsApp")
             
@@ -125,7 +218,8 @@ class NocksupClient:
             # Initialize authenticator
             self.authenticator = Authenticator(
                 self.phone_number,
-                self.session_store
+                self.session_store,
+                http_client=self.http_client
             )
             
             # Authenticate with specified method
@@ -136,17 +230,21 @@ class NocksupClient:
             )
             
             if auth_success:
-                # Initialize other managers now that we're connected
-                self.contact_manager = ContactManager(self.connection, self.contact_store)
-                self.group_manager = GroupManager(self.connection)
+                # Initialize other managers now that we're connected; on
+                # later connects, keep them and point them at the new connection
+                if self.contact_manager is None:
+                    self.contact_manager = ContactManager(self.connection, self.contact_store)
+                    self.group_manager = GroupManager(self.connection)
+                else:
+                    self.contact_manager.connection = self.connection
+                    self.group_manager.connection = self.connection
                 
-                # Connect to WebSocket server
+                # Connect to WebSocket server; every received frame reaches
+                # _on_message_received, which feeds the dispatch thread
                 self.connection.connect()
                 
-                # Register for messages
-                self._register_message_handlers()
-                
                 self.connected = True
+                self._disconnect_event.clear()
                 logger.info("Connected to WhatsApp")
                 return True
             else:
@@ -162,6 +260,9 @@ class NocksupClient:
     
     def disconnect(self) -> None:
         """Disconnect from WhatsApp servers."""
+        # Cancel any reconnect, which runs while `connected` is False
+        self._stop_reconnect.set()
+        
         if self.connected:
             logger.info("Disconnecting from WhatsApp")
             
@@ -172,8 +273,21 @@ class NocksupClient:
                 self.authenticator.disconnect()
             
             self.connected = False
+            self._disconnect_event.set()
             logger.info("Disconnected from WhatsApp")
     
+    def wait_for_disconnect(self, timeout: float = None) -> bool:
+        """
+        Block until the client is disconnected.
+        
+        Args:
+            timeout: Maximum time to wait in seconds (None waits forever)
+            
+        Returns:
+            True if the client is disconnected, False if the timeout expired
+        """
+        return self._disconnect_event.wait(timeout)
+    
     def register_number(self, method: str = 'sms', 
                       language: str = 'en', country_code: str = None) -> Dict[str, Any]:
         """
@@ -193,7 +307,7 @@ class NocksupClient:
         if not self.phone_number:
             raise ValidationError("Phone number not set")
         
-        logger.info(f"Registering phone number: {self.phone_number}")
+        logger.info("Registering phone number: %s", self.phone_number)
         return self.registration.request_code(
             self.phone_number, method, language, country_code
         )
@@ -214,7 +328,7 @@ class NocksupClient:
         if not self.phone_number:
             raise ValidationError("Phone number not set")
         
-        logger.info(f"Verifying code for {self.phone_number}")
+        logger.info("Verifying code for %s", self.phone_number)
         return self.registration.verify_code(self.phone_number, code)
     
     def send_text_message(self, to: str, text: str) -> str:
@@ -230,30 +344,17 @@ class NocksupClient:
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If the recipient or content is invalid
             MessageError: If message sending fails
         """
         self._ensure_connected()
         
-        try:
-            # Create message
-            message = Message.create_text_message(to, text)
-            
-            # Prepare for sending
-            encoded = message.prepare_for_sending()
-            
-            # Send message
-            success = self.connection.send_message(encoded)
-            
-            if not success:
-                raise MessageError("Failed to send message")
-            
-            return message.id
-            
-        except Exception as e:
-            logger.error(f"Failed to send text message: {e}")
-            raise MessageError(f"Failed to send text message: {str(e)}")
+        # Create message
+        message = Message.create_text_message(to, text)
+        
+        return self._send(message, "message")
     
-    def send_image(self, to: str, image_path: str, caption: str = None) -> str:
+    def send_image(self, to: str, image_path: str, caption: str = None, wait: bool = True) -> str:
         """
         Send image message.
         
@@ -261,40 +362,26 @@ class NocksupClient:
             to: Recipient phone number or JID
             image_path: Path to image file
             caption: Optional caption
+            wait: Upload and send before returning; if False the upload
+                  runs on the media worker thread and failures are logged
             
         Returns:
             Message ID
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If the recipient or content is invalid
+            MediaError: If the media upload fails
             MessageError: If message sending fails
         """
         self._ensure_connected()
         
-        try:
-            # Upload media
-            logger.info(f"Uploading image: {image_path}")
-            media_info = self.media_uploader.upload(image_path, "image")
-            
-            # Create message
-            message = Message.create_image_message(to, media_info['media_url'], caption)
-            
-            # Prepare for sending
-            encoded = message.prepare_for_sending()
-            
-            # Send message
-            success = self.connection.send_message(encoded)
-            
-            if not success:
-                raise MessageError("Failed to send image")
-            
-            return message.id
-            
-        except Exception as e:
-            logger.error(f"Failed to send image message: {e}")
-            raise MessageError(f"Failed to send image message: {str(e)}")
+        # Create message; the media URL is filled in after the upload
+        message = Message.create_image_message(to, None, caption)
+        
+        return self._send_media(message, image_path, "image", wait)
     
-    def send_video(self, to: str, video_path: str, caption: str = None) -> str:
+    def send_video(self, to: str, video_path: str, caption: str = None, wait: bool = True) -> str:
         """
         Send video message.
         
@@ -302,80 +389,52 @@ class NocksupClient:
             to: Recipient phone number or JID
             video_path: Path to video file
             caption: Optional caption
+            wait: Upload and send before returning; if False the upload
+                  runs on the media worker thread and failures are logged
             
         Returns:
             Message ID
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If the recipient or content is invalid
+            MediaError: If the media upload fails
             MessageError: If message sending fails
         """
         self._ensure_connected()
         
-        try:
-            # Upload media
-            logger.info(f"Uploading video: {video_path}")
-            media_info = self.media_uploader.upload(video_path, "video")
-            
-            # Create message
-            message = Message.create_video_message(to, media_info['media_url'], caption)
-            
-            # Prepare for sending
-            encoded = message.prepare_for_sending()
-            
-            # Send message
-            success = self.connection.send_message(encoded)
-            
-            if not success:
-                raise MessageError("Failed to send video")
-            
-            return message.id
-            
-        except Exception as e:
-            logger.error(f"Failed to send video message: {e}")
-            raise MessageError(f"Failed to send video message: {str(e)}")
+        # Create message; the media URL is filled in after the upload
+        message = Message.create_video_message(to, None, caption)
+        
+        return self._send_media(message, video_path, "video", wait)
     
-    def send_audio(self, to: str, audio_path: str) -> str:
+    def send_audio(self, to: str, audio_path: str, wait: bool = True) -> str:
         """
         Send audio message.
         
         Args:
             to: Recipient phone number or JID
             audio_path: Path to audio file
+            wait: Upload and send before returning; if False the upload
+                  runs on the media worker thread and failures are logged
             
         Returns:
             Message ID
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If the recipient or content is invalid
+            MediaError: If the media upload fails
             MessageError: If message sending fails
         """
         self._ensure_connected()
         
-        try:
-            # Upload media
-            logger.info(f"Uploading audio: {audio_path}")
-            media_info = self.media_uploader.upload(audio_path, "audio")
-            
-            # Create message
-            message = Message.create_audio_message(to, media_info['media_url'])
-            
-            # Prepare for sending
-            encoded = message.prepare_for_sending()
-            
-            # Send message
-            success = self.connection.send_message(encoded)
-            
-            if not success:
-                raise MessageError("Failed to send audio")
-            
-            return message.id
-            
-        except Exception as e:
-            logger.error(f"Failed to send audio message: {e}")
-            raise MessageError(f"Failed to send audio message: {str(e)}")
+        # Create message; the media URL is filled in after the upload
+        message = Message.create_audio_message(to, None)
+        
+        return self._send_media(message, audio_path, "audio", wait)
     
-    def send_document(self, to: str, document_path: str, caption: str = None) -> str:
+    def send_document(self, to: str, document_path: str, caption: str = None, wait: bool = True) -> str:
         """
         Send document message.
         
@@ -383,38 +442,24 @@ class NocksupClient:
             to: Recipient phone number or JID
             document_path: Path to document file
             caption: Optional caption
+            wait: Upload and send before returning; if False the upload
+                  runs on the media worker thread and failures are logged
             
         Returns:
             Message ID
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If the recipient or content is invalid
+            MediaError: If the media upload fails
             MessageError: If message sending fails
         """
         self._ensure_connected()
         
-        try:
-            # Upload media
-            logger.info(f"Uploading document: {document_path}")
-            media_info = self.media_uploader.upload(document_path, "document")
-            
-            # Create message
-            message = Message.create_document_message(to, media_info['media_url'], caption)
-            
-            # Prepare for sending
-            encoded = message.prepare_for_sending()
-            
-            # Send message
-            success = self.connection.send_message(encoded)
-            
-            if not success:
-                raise MessageError("Failed to send document")
-            
-            return message.id
-            
-        except Exception as e:
-            logger.error(f"Failed to send document message: {e}")
-            raise MessageError(f"Failed to send document message: {str(e)}")
+        # Create message; the media URL is filled in after the upload
+        message = Message.create_document_message(to, None, caption)
+        
+        return self._send_media(message, document_path, "document", wait)
     
     def send_location(self, to: str, latitude: float, longitude: float,
                     name: str = None, address: str = None) -> str:
@@ -433,28 +478,15 @@ class NocksupClient:
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If the recipient or content is invalid
             MessageError: If message sending fails
         """
         self._ensure_connected()
         
-        try:
-            # Create message
-            message = Message.create_location_message(to, latitude, longitude, name, address)
-            
-            # Prepare for sending
-            encoded = message.prepare_for_sending()
-            
-            # Send message
-            success = self.connection.send_message(encoded)
-            
-            if not success:
-                raise MessageError("Failed to send location")
-            
-            return message.id
-            
-        except Exception as e:
-            logger.error(f"Failed to send location message: {e}")
-            raise MessageError(f"Failed to send location message: {str(e)}")
+        # Create message
+        message = Message.create_location_message(to, latitude, longitude, name, address)
+        
+        return self._send(message, "location")
     
     def send_contact(self, to: str, contacts: List[Dict[str, str]]) -> str:
         """
@@ -469,30 +501,17 @@ class NocksupClient:
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If the recipient or content is invalid
             MessageError: If message sending fails
         """
         self._ensure_connected()
         
-        try:
-            # Create message
-            message = Message.create_contact_message(to, contacts)
-            
-            # Prepare for sending
-            encoded = message.prepare_for_sending()
-            
-            # Send message
-            success = self.connection.send_message(encoded)
-            
-            if not success:
-                raise MessageError("Failed to send contacts")
-            
-            return message.id
-            
-        except Exception as e:
-            logger.error(f"Failed to send contact message: {e}")
-            raise MessageError(f"Failed to send contact message: {str(e)}")
+        # Create message
+        message = Message.create_contact_message(to, contacts)
+        
+        return self._send(message, "contacts")
     
-    def create_group(self, subject: str, participants: List[str]) -> Dict[str, Any]:
+    def create_group(self, subject: str, participants: Iterable[str]) -> Dict[str, Any]:
         """
         Create a new WhatsApp group.
         
@@ -509,7 +528,7 @@ class NocksupClient:
         self._ensure_connected()
         return self.group_manager.create_group(subject, participants)
     
-    def add_group_participants(self, group_id: str, participants: List[str]) -> bool:
+    def add_group_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Add participants to a group.
         
@@ -526,7 +545,7 @@ class NocksupClient:
         self._ensure_connected()
         return self.group_manager.add_participants(group_id, participants)
     
-    def remove_group_participants(self, group_id: str, participants: List[str]) -> bool:
+    def remove_group_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Remove participants from a group.
         
@@ -592,7 +611,7 @@ class NocksupClient:
         self._ensure_connected()
         return self.group_manager.update_subject(group_id, subject)
     
-    def promote_group_participants(self, group_id: str, participants: List[str]) -> bool:
+    def promote_group_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Promote participants to group admins.
         
@@ -609,7 +628,7 @@ class NocksupClient:
         self._ensure_connected()
         return self.group_manager.promote_participants(group_id, participants)
     
-    def demote_group_participants(self, group_id: str, participants: List[str]) -> bool:
+    def demote_group_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Demote participants from group admins.
         
@@ -630,6 +649,9 @@ class NocksupClient:
         """
         Get contact information.
         
+        Results are cached for CONTACT_CACHE_TTL seconds, keyed by the
+        normalized phone number.
+        
         Args:
             phone_number: Contact phone number
             
@@ -638,14 +660,64 @@ class NocksupClient:
             
         Raises:
             ConnectionError: If not connected
+            ValidationError: If phone number is invalid
         """
         self._ensure_connected()
-        return self.contact_manager.get_contact(phone_number)
+        
+        try:
+            phone = validate_phone_number(phone_number)
+        except ValueError as e:
+            raise ValidationError(f"Invalid phone number: {e}")
+        
+        now = time.monotonic_ns()
+        with self._contact_cache_lock:
+            cached = self._contact_cache.get(phone)
+            if cached and cached[0] > now:
+                self._contact_cache.move_to_end(phone)
+                return cached[1].copy()
+        
+        contact = self.contact_manager.get_contact(phone)
+        
+        # Cache the result, evicting the least recently used entry when full
+        with self._contact_cache_lock:
+            self._contact_cache[phone] = (now + _CONTACT_CACHE_TTL_NS, contact.copy())
+            self._contact_cache.move_to_end(phone)
+            if len(self._contact_cache) > CONTACT_CACHE_SIZE:
+                self._contact_cache.popitem(last=False)
+        
+        return contact
+    
+    def clear_contact_cache(self, phone_number: str = None) -> None:
+        """
+        Clear cached contact lookups.
+        
+        Args:
+            phone_number: Phone number to forget (clears all if None)
+        """
+        if phone_number is None:
+            with self._contact_cache_lock:
+                self._contact_cache.clear()
+            return
+        
+        try:
+            phone = validate_phone_number(phone_number)
+        except ValueError:
+            # Invalid numbers are never cached
+            return
+        
+        with self._contact_cache_lock:
+            self._contact_cache.pop(phone, None)
     
-    def get_contacts(self) -> List[Dict[str, Any]]:
+    def get_contacts(self, phone_numbers: List[str] = None) -> List[Dict[str, Any]]:
         """
-        Get all contacts.
+        Get contacts.
         
+        Contacts that are not stored locally are fetched with a single
+        request, so prefer this over calling get_contact in a loop.
+        
+        Args:
+            phone_numbers: Phone numbers to look up (all contacts if None)
+            
         Returns:
             List of contact information
             
@@ -653,7 +725,7 @@ class NocksupClient:
             ConnectionError: If not connected
         """
         self._ensure_connected()
-        return self.contact_manager.get_contacts()
+        return self.contact_manager.get_contacts(phone_numbers)
     
     def check_phone_exists(self, phone_number: str) -> bool:
         """
@@ -671,6 +743,46 @@ class NocksupClient:
         self._ensure_connected()
         return self.contact_manager.check_phone_exists(phone_number)
     
+    def update_contact_name(self, phone_number: str, name: str) -> bool:
+        """
+        Update a contact's name locally.
+        
+        Args:
+            phone_number: Contact phone number
+            name: New contact name
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            ConnectionError: If not connected
+            ValidationError: If a phone number is invalid
+        """
+        return self.update_contact_names({phone_number: name})
+    
+    def update_contact_names(self, names: Dict[str, str]) -> bool:
+        """
+        Update several contact names locally.
+        
+        Args:
+            names: Mapping of contact phone number to new name
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            ConnectionError: If not connected
+            ValidationError: If a phone number is invalid
+        """
+        self._ensure_connected()
+        result = self.contact_manager.update_contact_names(names)
+        
+        # Drop cached lookups so get_contact returns the new names
+        for phone_number in names:
+            self.clear_contact_cache(phone_number)
+        
+        return result
+    
     def download_media(self, media_url: str, output_path: str, 
                      media_key: str = None) -> str:
         """
@@ -692,8 +804,28 @@ class NocksupClient:
         
         Args:
             callback: Function to call when a message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
+        """
+        self._start_dispatcher()
+        self._wildcard_callback = callback
+    
+    def on_message_batch(self, callback: Callable[[List[Dict[str, Any]]], None]) -> None:
+        """
+        Register callback for batches of messages.
+        
+        The callback gets every message buffered since the previous call
+        as one list, before the per-message callbacks run for them.
+        
+        Args:
+            callback: Function to call with a list of received messages
+            
+        Raises:
+            MessageError: If messages() is being iterated
         """
-        self.message_callbacks['*'] = callback
+        self._start_dispatcher()
+        self._batch_callback = callback
     
     def on_text_message(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
@@ -701,8 +833,12 @@ class NocksupClient:
         
         Args:
             callback: Function to call when a text message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
         """
-        self.message_callbacks['text'] = callback
+        self._start_dispatcher()
+        self._type_callbacks['text'] = callback
     
     def on_image_message(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
@@ -710,8 +846,12 @@ class NocksupClient:
         
         Args:
             callback: Function to call when an image message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
         """
-        self.message_callbacks['image'] = callback
+        self._start_dispatcher()
+        self._type_callbacks['image'] = callback
     
     def on_video_message(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
@@ -719,8 +859,12 @@ class NocksupClient:
         
         Args:
             callback: Function to call when a video message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
         """
-        self.message_callbacks['video'] = callback
+        self._start_dispatcher()
+        self._type_callbacks['video'] = callback
     
     def on_audio_message(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
@@ -728,8 +872,12 @@ class NocksupClient:
         
         Args:
             callback: Function to call when an audio message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
         """
-        self.message_callbacks['audio'] = callback
+        self._start_dispatcher()
+        self._type_callbacks['audio'] = callback
     
     def on_document_message(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
@@ -737,8 +885,12 @@ class NocksupClient:
         
         Args:
             callback: Function to call when a document message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
         """
-        self.message_callbacks['document'] = callback
+        self._start_dispatcher()
+        self._type_callbacks['document'] = callback
     
     def on_location_message(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
@@ -746,8 +898,12 @@ class NocksupClient:
         
         Args:
             callback: Function to call when a location message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
         """
-        self.message_callbacks['location'] = callback
+        self._start_dispatcher()
+        self._type_callbacks['location'] = callback
     
     def on_contact_message(self, callback: Callable[[Dict[str, Any]], None]) -> None:
         """
@@ -755,92 +911,299 @@ class NocksupClient:
         
         Args:
             callback: Function to call when a contact message is received
+            
+        Raises:
+            MessageError: If messages() is being iterated
+        """
+        self._start_dispatcher()
+        self._type_callbacks['contact'] = callback
+    
+    def _send_media(self, message: Message, file_path: str,
+                    media_type: str, wait: bool) -> str:
+        """
+        Upload a media file and send its message, now or on the media worker.
+        
+        Args:
+            message: Media message without a media URL
+            file_path: Path to the media file
+            media_type: Type of media
+            wait: Upload and send before returning
+            
+        Returns:
+            Message ID
+            
+        Raises:
+            MediaError: If the file is missing or the media upload fails
+            MessageError: If message sending fails
+        """
+        if wait:
+            return self._upload_and_send(message, file_path, media_type)
+        
+        from nocksup.messaging.media import open_media_file
+        
+        # Open the file now, so a missing file fails here instead of only
+        # being logged by the worker. The worker uploads from this same
+        # descriptor rather than opening the path again
+        file = open_media_file(file_path)
+        
+        try:
+            # Reserve the ID now so it can be returned before the upload
+            message_id = message.ensure_id()
+            
+            # Blocks while MEDIA_QUEUE_SIZE uploads are already waiting
+            self._start_media_worker()
+            self._media_queue.put((message, file_path, media_type, file))
+        except BaseException:
+            file.close()
+            raise
+        
+        return message_id
+    
+    def _upload_and_send(self, message: Message, file_path: str,
+                         media_type: str, file: BinaryIO = None) -> str:
+        """
+        Upload a media file and send its message.
+        
+        Args:
+            message: Media message without a media URL
+            file_path: Path to the media file
+            media_type: Type of media
+            file: The file already opened, if any; closed after the upload
+            
+        Returns:
+            Message ID
+            
+        Raises:
+            MediaError: If the media upload fails
+            MessageError: If message sending fails
+        """
+        # Upload media
+        logger.info("Uploading %s: %s", media_type, file_path)
+        media_info = self.media_uploader.upload(file_path, media_type, file)
+        message.media_url = media_info['media_url']
+        
+        return self._send(message, media_type)
+    
+    def _send(self, message: Message, what: str) -> str:
+        """
+        Encode a message and queue it on the connection.
+        
+        Args:
+            message: Message to send
+            what: What is being sent, for the error message
+            
+        Returns:
+            Message ID
+            
+        Raises:
+            MessageError: If message sending fails
         """
-        self.message_callbacks['contact'] = callback
+        encoded = message.prepare_for_sending()
+        
+        if not self.connection.send_message(encoded):
+            raise MessageError(f"Failed to send {what}")
+        
+        return message.id
+    
+    def _start_media_worker(self) -> None:
+        """Start the thread that uploads and sends queued media messages."""
+        with self._media_lock:
+            if self._media_thread is None:
+                self._media_thread = threading.Thread(
+                    target=self._media_thread_func,
+                    daemon=True
+                )
+                self._media_thread.start()
+    
+    def _media_thread_func(self) -> None:
+        """Thread function for uploading and sending queued media messages."""
+        while True:
+            message, file_path, media_type, file = self._media_queue.get()
+            
+            try:
+                self._upload_and_send(message, file_path, media_type, file)
+            except Exception as e:
+                logger.error("Failed to send %s message %s: %s", media_type, message.id, e)
+            finally:
+                self._media_queue.task_done()
     
     def _ensure_connected(self) -> None:
         """
         Ensure that client is connected.
         
+        Only the client's own flag is checked. While the connection manager
+        reconnects after a dropped socket, sends are queued and go out once
+        it is back; if it gives up it reports the closure and the flag drops.
+        
         Raises:
             ConnectionError: If not connected
         """
-        if not self.connected or not self.connection or not self.connection.is_connected():
+        if not self.connected:
             logger.error("Not connected to WhatsApp")
             raise ConnectionError("Not connected to WhatsApp")
     
-    def _register_message_handlers(self) -> None:
-        """Register message handlers with the connection manager."""
-        if self.connection:
-            # Register handlers for different message types
-            self.connection.register_handler('text', self._handle_text_message)
-            self.connection.register_handler('image', self._handle_media_message)
-            self.connection.register_handler('video', self._handle_media_message)
-            self.connection.register_handler('audio', self._handle_media_message)
-            self.connection.register_handler('document', self._handle_media_message)
-            self.connection.register_handler('location', self._handle_location_message)
-            self.connection.register_handler('contact', self._handle_contact_message)
-    
-    def _on_message_received(self, message: Dict[str, Any]) -> None:
+    def messages(self, timeout: float = None) -> Iterator[Dict[str, Any]]:
         """
-        Handle received message.
+        Iterate over received messages.
+        
+        Waits until messages arrive, then yields everything buffered so far
+        before waiting again, so a burst crosses from the receive thread in
+        one hand-off. Use this instead of registering callbacks; both draw
+        from the same buffer, so they can't be used together.
         
         Args:
-            message: Message data
+            timeout: Stop after this many seconds without a message
+                     (None waits indefinitely)
+            
+        Returns:
+            Iterator over message data
+            
+        Raises:
+            MessageError: If message callbacks are registered
         """
-        # Call callback for all messages if registered
-        if '*' in self.message_callbacks:
-            self.message_callbacks['*'](message)
+        # Checked here as well as in the iterator, so misuse fails at the call
+        self._start_reading()
+        self._stop_reading()
         
-        # Call type-specific callback if registered
-        message_type = message.get('type')
-        if message_type in self.message_callbacks:
-            self.message_callbacks[message_type](message)
+        return self._iter_messages(timeout)
     
-    def _handle_text_message(self, message: Dict[str, Any]) -> None:
+    def _iter_messages(self, timeout: float = None) -> Iterator[Dict[str, Any]]:
         """
-        Handle text message.
+        Yield received messages for messages().
         
         Args:
-            message: Message data
+            timeout: Stop after this many seconds without a message
+            
+        Yields:
+            Message data
+        """
+        self._start_reading()
+        try:
+            for batch in self._message_batches(timeout):
+                yield from batch
+        finally:
+            self._stop_reading()
+    
+    def _start_reading(self) -> None:
+        """
+        Register a messages() reader of the inbox.
+        
+        Raises:
+            MessageError: If message callbacks are registered
         """
-        # Process text message
-        if 'text' in self.message_callbacks:
-            self.message_callbacks['text'](message)
+        with self._inbox_ready:
+            if self._dispatch_thread is not None:
+                raise MessageError("messages() can't be used once message callbacks are registered")
+            self._inbox_readers += 1
     
-    def _handle_media_message(self, message: Dict[str, Any]) -> None:
+    def _stop_reading(self) -> None:
+        """Unregister a messages() reader of the inbox."""
+        with self._inbox_ready:
+            self._inbox_readers -= 1
+    
+    def _message_batches(self, timeout: float = None) -> Iterator[deque]:
         """
-        Handle media message.
+        Iterate over batches of received messages.
         
         Args:
-            message: Message data
+            timeout: Stop after this many seconds without a message
+                     (None waits indefinitely)
+            
+        Yields:
+            Everything buffered since the previous batch
+        """
+        with self._inbox_ready:
+            self._inbox_consumed = True
+        
+        while True:
+            with self._inbox_ready:
+                if not self._inbox_ready.wait_for(lambda: self._inbox, timeout):
+                    return
+                batch, self._inbox = self._inbox, deque(maxlen=INBOX_MAX_SIZE)
+                dropped, self._inbox_dropped = self._inbox_dropped, 0
+            
+            if dropped:
+                logger.warning("Inbox was full, dropped %d oldest messages", dropped)
+            
+            yield batch
+    
+    def _start_dispatcher(self) -> None:
         """
-        # Process media message based on type
-        media_type = message.get('media_type')
-        if media_type in self.message_callbacks:
-            self.message_callbacks[media_type](message)
+        Start the thread that delivers buffered messages to callbacks.
+        
+        Raises:
+            MessageError: If messages() is being iterated
+        """
+        with self._inbox_ready:
+            if self._inbox_readers:
+                raise MessageError("Message callbacks can't be registered while messages() is in use")
+            self._inbox_consumed = True
+            if self._dispatch_thread is None:
+                self._dispatch_thread = threading.Thread(
+                    target=self._dispatch_thread_func,
+                    daemon=True
+                )
+                self._dispatch_thread.start()
+    
+    def _dispatch_thread_func(self) -> None:
+        """Thread function for delivering messages to registered callbacks."""
+        for batch in self._message_batches():
+            # Hand the whole batch over first if a batch callback is registered
+            if self._batch_callback:
+                self._run_callback(self._batch_callback, list(batch))
+            
+            # Read the registry once per batch rather than once per message
+            wildcard_callback = self._wildcard_callback
+            type_callbacks = self._type_callbacks
+            run_callback = self._run_callback
+            
+            for message in batch:
+                # Call callback for all messages if registered
+                if wildcard_callback:
+                    run_callback(wildcard_callback, message)
+                
+                # Call the subtype callback for chat messages if registered
+                if type_callbacks and message.get('type') == 'message':
+                    callback = type_callbacks.get(message.get('subtype', 'text'))
+                    if callback:
+                        run_callback(callback, message)
     
-    def _handle_location_message(self, message: Dict[str, Any]) -> None:
+    def _run_callback(self, callback: Callable[[Any], None], message: Any) -> None:
         """
-        Handle location message.
+        Run a user callback, logging instead of propagating its errors.
         
         Args:
-            message: Message data
+            callback: Registered callback
+            message: Message data, or a list of messages for batch callbacks
         """
-        # Process location message
-        if 'location' in self.message_callbacks:
-            self.message_callbacks['location'](message)
+        try:
+            callback(message)
+        except Exception as e:
+            logger.exception("Error in message callback: %s", e)
     
-    def _handle_contact_message(self, message: Dict[str, Any]) -> None:
+    def _on_message_received(self, message: Dict[str, Any]) -> None:
         """
-        Handle contact message.
+        Handle received message.
+        
+        Only buffers the message; callbacks run on the dispatch thread.
+        Messages are discarded until a callback is registered or
+        messages() is first iterated.
         
         Args:
             message: Message data
         """
-        # Process contact message
-        if 'contact' in self.message_callbacks:
-            self.message_callbacks['contact'](message)
+        with self._inbox_ready:
+            if not self._inbox_consumed:
+                return
+            
+            if len(self._inbox) == INBOX_MAX_SIZE:
+                # Warn once when an overflow starts; the total is logged
+                # when the consumer next takes a batch
+                if not self._inbox_dropped:
+                    logger.warning("Inbox full, dropping oldest messages")
+                self._inbox_dropped += 1
+            self._inbox.append(message)
+            self._inbox_ready.notify_all()
     
     def _on_connection_error(self, error: Exception) -> None:
         """
@@ -863,22 +1226,75 @@ class NocksupClient:
             self._try_reconnect()
     
     def _try_reconnect(self) -> None:
-        """Try to reconnect to WhatsApp."""
-        # Try to reconnect a few times
-        for attempt in range(3):
+        """
+        Try to reconnect to WhatsApp.
+        
+        Only resumes the existing session; a fresh QR or pairing login
+        needs the user, so it is never started from here. Stops early
+        when disconnect() is called.
+        """
+        stop = self._stop_reconnect
+        deadline = time.monotonic() + RECONNECT_TIMEOUT
+        delay = 1.0
+        attempt = 0
+        
+        while not stop.is_set() and time.monotonic() < deadline:
+            attempt += 1
+            
+            # Exponential backoff with full jitter, so clients dropped
+            # together don't all reconnect at the same moment
+            if stop.wait(random.uniform(0, delay)):
+                break
+            
             try:
-                logger.info(f"Reconnect attempt {attempt + 1}")
-                time.sleep(5 * (attempt + 1))  # Exponential backoff
+                logger.info("Reconnect attempt %d", attempt)
                 
-                # Reconnect
-                if self.connect(restore_session=True):
+                # Resume on the existing managers, keeping their session
+                # and caches
+                if self._resume():
                     logger.info("Reconnected successfully")
                     return
                     
             except Exception as e:
                 logger.error(f"Reconnection attempt failed: {e}")
+            
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        
+        if stop.is_set():
+            logger.info("Reconnect cancelled")
+        else:
+            logger.error("Failed to reconnect after multiple attempts")
+        self._disconnect_event.set()
+    
+    def _resume(self) -> bool:
+        """
+        Restore the session and reopen the connection on the existing managers.
+        
+        Returns:
+            True if reconnected
+            
+        Raises:
+            AuthenticationError: If the session can't be restored
+            ConnectionError: If the connection can't be reopened
+        """
+        if not self.connection or not self.authenticator:
+            return False
+        
+        if not self.authenticator.resume_session():
+            return False
+        
+        # Reopen the WebSocket; queued sends go out once it is up
+        self.connection.disconnect()
+        self.connection.connect()
+        
+        # disconnect() may have been called while the socket was reopening
+        if self._stop_reconnect.is_set():
+            self.connection.disconnect()
+            return False
         
-        logger.error("Failed to reconnect after multiple attempts")
+        self.connected = True
+        self._disconnect_event.clear()
+        return True
     
     def __enter__(self):
         """Context manager entry."""
@@ -7,7 +7,7 @@ including retrieving contact information and checking phone numbers.
 from typing import Dict, Any, List, Optional, Union
 
 from nocksup.utils.logger import logger
-from nocksup.utils import validate_phone_number, phone_to_jid
+from nocksup.utils import validate_phone_number, validate_phone_numbers, phone_to_jid
 from nocksup.exceptions import ContactError, ValidationError
 from nocksup.protocols.constants import WHATSAPP_DOMAIN
 from nocksup.storage.contact_store import ContactStore
@@ -49,43 +49,7 @@ class ContactManager:
             # Validate phone number
             phone = validate_phone_number(phone_number)
             
-            # Check if we have contact in local storage
-            contact = self.contact_store.get_contact(phone)
-            if contact:
-                logger.debug(f"Contact found in local storage: {phone}")
-                return contact
-            
-            # If not in local storage, request from server
-            jid = phone_to_jid(phone, WHATSAPP_DOMAIN)
-            
-            # Create contact info request
-            info_msg = {
-                "type": "contact",
-                "action": "info",
-                "jid": jid
-            }
-            
-            # Send request
-            encoded = self.connection.protocol.encode_message(info_msg)
-            self.connection.send_message(encoded)
-            
-            # In a real implementation, we would wait for a response
-            # from the server with the contact information
-            
-            # For this demo, we'll simulate a response
-            # This would normally come from the server
-            contact_info = {
-                "jid": jid,
-                "phone": phone,
-                "name": "Unknown",
-                "status": "Hey there! I am using WhatsApp.",
-                "is_whatsapp_user": True
-            }
-            
-            # Store in local storage
-            self.contact_store.add_contact(contact_info)
-            
-            return contact_info
+            return self._fetch_contacts([phone])[0]
             
         except ValidationError:
             # Re-raise validation errors
@@ -94,21 +58,40 @@ class ContactManager:
             logger.error(f"Failed to get contact: {e}")
             raise ContactError(f"Failed to get contact: {str(e)}")
     
-    def get_contacts(self) -> List[Dict[str, Any]]:
+    def get_contacts(self, phone_numbers: List[str] = None) -> List[Dict[str, Any]]:
         """
-        Get all contacts.
+        Get contacts.
         
+        Args:
+            phone_numbers: Phone numbers to look up (all contacts if None)
+            
         Returns:
-            List of contact information
+            List of contact information, in the order of phone_numbers
+            when given
             
         Raises:
             ContactError: If operation fails
+            ValidationError: If a phone number is invalid
         """
+        if phone_numbers is not None:
+            # Validate phone numbers
+            try:
+                phones = [validate_phone_number(phone) for phone in phone_numbers]
+            except ValueError as e:
+                raise ValidationError(f"Invalid phone number: {e}")
+            
+            try:
+                return self._fetch_contacts(phones)
+                
+            except Exception as e:
+                logger.error(f"Failed to get contacts: {e}")
+                raise ContactError(f"Failed to get contacts: {str(e)}")
+        
         try:
             # Check if we have contacts in local storage
             contacts = self.contact_store.get_all_contacts()
             if contacts:
-                logger.debug(f"Found {len(contacts)} contacts in local storage")
+                logger.debug("Found %d contacts in local storage", len(contacts))
                 return contacts
             
             # If not in local storage, request from server
@@ -144,8 +127,7 @@ class ContactManager:
             ]
             
             # Store in local storage
-            for contact in contacts:
-                self.contact_store.add_contact(contact)
+            self.contact_store.add_contacts(contacts)
             
             return contacts
             
@@ -153,6 +135,71 @@ class ContactManager:
             logger.error(f"Failed to get contacts: {e}")
             raise ContactError(f"Failed to get contacts: {str(e)}")
     
+    def _fetch_contacts(self, phones: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get contact information for validated phone numbers.
+        
+        Contacts missing from local storage are requested from the server
+        with a single sync request.
+        
+        Args:
+            phones: Validated phone numbers
+            
+        Returns:
+            List of contact information, in the order of phones
+        """
+        contacts = {}
+        missing = []
+        
+        # Check which contacts we have in local storage (each phone once)
+        for phone in dict.fromkeys(phones):
+            contact = self.contact_store.get_contact(phone)
+            if contact:
+                logger.debug("Contact found in local storage: %s", phone)
+                contacts[phone] = contact
+            else:
+                missing.append(phone)
+        
+        if missing:
+            # Request all missing contacts from the server at once, with
+            # the same sync request sync_contacts() sends
+            jids = [phone_to_jid(phone, WHATSAPP_DOMAIN) for phone in missing]
+            
+            # Create sync request
+            sync_msg = {
+                "type": "contact",
+                "action": "sync",
+                "phones": missing
+            }
+            
+            # Send request
+            encoded = self.connection.protocol.encode_message(sync_msg)
+            self.connection.send_message(encoded)
+            
+            # In a real implementation, we would wait for a response
+            # from the server with the contact information
+            
+            # For this demo, we'll simulate a response
+            # This would normally come from the server
+            fetched = [
+                {
+                    "jid": jid,
+                    "phone": phone,
+                    "name": "Unknown",
+                    "status": "Hey there! I am using WhatsApp.",
+                    "is_whatsapp_user": True
+                }
+                for phone, jid in zip(missing, jids)
+            ]
+            
+            # Store in local storage
+            self.contact_store.add_contacts(fetched)
+            
+            for contact in fetched:
+                contacts[contact['phone']] = contact
+        
+        return [contacts[phone] for phone in phones]
+    
     def check_phone_exists(self, phone_number: str) -> bool:
         """
         Check if a phone number exists on WhatsApp.
@@ -171,6 +218,12 @@ class ContactManager:
             # Validate phone number
             phone = validate_phone_number(phone_number)
             
+            # Numbers already known to be on WhatsApp are answered from
+            # local storage, without a round-trip or a rewrite of the store
+            contact = self.contact_store.get_contact(phone)
+            if contact and contact.get('is_whatsapp_user'):
+                return True
+            
             # Create exists request
             exists_msg = {
                 "type": "contact",
@@ -221,14 +274,10 @@ class ContactManager:
             ContactError: If operation fails
         """
         try:
-            # Validate and format phone numbers
-            formatted_numbers = []
-            for phone in phone_numbers:
-                try:
-                    formatted_numbers.append(validate_phone_number(phone))
-                except ValidationError as e:
-                    logger.warning(f"Invalid phone number {phone}: {e}")
-                    # Skip invalid numbers
+            # Validate and format phone numbers, skipping invalid ones
+            formatted_numbers, invalid_numbers = validate_phone_numbers(phone_numbers)
+            for phone in invalid_numbers:
+                logger.warning("Invalid phone number %s", phone)
             
             if not formatted_numbers:
                 raise ValidationError("No valid phone numbers provided")
@@ -262,9 +311,10 @@ class ContactManager:
                         "is_whatsapp_user": True
                     }
                     whatsapp_contacts.append(contact)
-                    
-                    # Store in local storage
-                    self.contact_store.add_contact(contact)
+            
+            # Store in local storage
+            if whatsapp_contacts:
+                self.contact_store.add_contacts(whatsapp_contacts)
             
             return whatsapp_contacts
             
@@ -290,28 +340,47 @@ class ContactManager:
             ContactError: If operation fails
             ValidationError: If phone number is invalid
         """
-        try:
-            # Validate phone number
-            phone = validate_phone_number(phone_number)
+        return self.update_contact_names({phone_number: name})
+    
+    def update_contact_names(self, names: Dict[str, str]) -> bool:
+        """
+        Update several contact names locally.
+        
+        Contacts missing from local storage are fetched with a single
+        request, and all updates are saved with a single write.
+        
+        Args:
+            names: Mapping of contact phone number to new name
             
-            # Get current contact info
-            contact = self.contact_store.get_contact(phone)
+        Returns:
+            True if successful
             
-            if not contact:
-                # Get from server if not in local storage
-                contact = self.get_contact(phone)
+        Raises:
+            ContactError: If operation fails
+            ValidationError: If a phone number is invalid
+        """
+        # Validate phone numbers
+        try:
+            renames = {
+                validate_phone_number(phone): name
+                for phone, name in names.items()
+            }
+        except ValueError as e:
+            raise ValidationError(f"Invalid phone number: {e}")
+        
+        try:
+            # Get current contact info, from the server if not stored locally
+            contacts = self._fetch_contacts(list(renames))
             
-            # Update name
-            contact['name'] = name
+            # Update names
+            for contact in contacts:
+                contact['name'] = renames[contact['phone']]
             
-            # Store updated contact
-            self.contact_store.add_contact(contact)
+            # Store updated contacts
+            self.contact_store.add_contacts(contacts)
             
             return True
             
-        except ValidationError:
-            # Re-raise validation errors
-            raise
         except Exception as e:
-            logger.error(f"Failed to update contact name: {e}")
-            raise ContactError(f"Failed to update contact name: {str(e)}")
+            logger.error(f"Failed to update contact names: {e}")
+            raise ContactError(f"Failed to update contact names: {str(e)}")
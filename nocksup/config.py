@@ -26,6 +26,49 @@ SOCKET_TIMEOUT = 30
 MAX_RETRIES = 5
 RETRY_DELAY = 3  # seconds
 
+# HTTP connection pool settings
+HTTP_POOL_CONNECTIONS = 10  # Number of hosts to keep pools for
+HTTP_POOL_MAXSIZE = 20  # Connections kept alive per host
+
+# Reuse TLS sessions when reconnecting to the same host (opt-in)
+TLS_SESSION_RESUMPTION = os.environ.get('NOCKSUP_TLS_RESUME') == '1'
+
+# Contact lookup cache settings
+CONTACT_CACHE_TTL = 300  # seconds
+CONTACT_CACHE_SIZE = 1024  # entries
+
+# Client reconnects: backoff cap between attempts, and how long to keep
+# trying to resume the session before giving up
+RECONNECT_MAX_DELAY = 60  # seconds
+RECONNECT_TIMEOUT = 300  # seconds
+
+# How long credentials kept in memory are reused to resume a session
+# before they are read from the session store again
+SESSION_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Validated phone numbers and their JIDs kept for repeated lookups
+PHONE_CACHE_SIZE = 4096  # entries
+
+# Recipients whose resolved JIDs are kept for repeated sends
+RECIPIENT_CACHE_SIZE = 1024  # entries
+
+# Received messages buffered for consumers; the oldest are dropped when full
+INBOX_MAX_SIZE = 1024  # messages
+
+# Pre-generated X25519 key pairs kept ready for authentication
+KEY_POOL_SIZE = 4
+
+# Media file hashes remembered by each uploader, so re-sending or retrying
+# an unchanged file skips re-hashing it
+FILE_HASH_CACHE_SIZE = 256  # entries
+
+# Media messages queued by non-blocking sends, each holding its file open;
+# further sends wait for a free slot
+MEDIA_QUEUE_SIZE = 32  # messages
+
+# Block size for media file reads/writes; large blocks mean fewer syscalls
+MEDIA_CHUNK_SIZE = 1024 * 1024  # bytes
+
 # Default paths
 DEFAULT_CONFIG_PATH = os.path.expanduser('~/.nocksup')
 DEFAULT_LOG_LEVEL = logging.INFO
@@ -4,13 +4,36 @@ Messaging module for WhatsApp communication.
 This module provides classes and functions for sending and receiving
 different types of WhatsApp messages, including text, media, and group messages.
 """
+import importlib
 
-from nocksup.messaging.message import Message, MessageType
-from nocksup.messaging.media import MediaMessage, MediaUploader, MediaDownloader
-from nocksup.messaging.group import GroupManager
+# Public names and the modules defining them, imported on first access
+_LAZY_IMPORTS = {
+    'Message': 'nocksup.messaging.message',
+    'MessageType': 'nocksup.messaging.message',
+    'MediaMessage': 'nocksup.messaging.media',
+    'MediaUploader': 'nocksup.messaging.media',
+    'MediaDownloader': 'nocksup.messaging.media',
+    'GroupManager': 'nocksup.messaging.group',
+}
 
 __all__ = [
     'Message', 'MessageType',
     'MediaMessage', 'MediaUploader', 'MediaDownloader',
     'GroupManager'
 ]
+
+def __getattr__(name):
+    """Import public names lazily on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List module attributes including lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
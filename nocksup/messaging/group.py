@@ -5,7 +5,7 @@ This module provides classes and functions for managing WhatsApp groups,
 including creation, adding/removing participants, and group information.
 """
 import time
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, List, Optional, Union
 
 from nocksup.utils.logger import logger
 from nocksup.utils import validate_phone_number, phone_to_jid, is_group_jid
@@ -32,7 +32,43 @@ class GroupManager:
         """
         self.connection = connection_manager
     
-    def create_group(self, subject: str, participants: List[str]) -> Dict[str, Any]:
+    def _format_participants(self, participants: Iterable[str]) -> List[str]:
+        """
+        Validate participants and convert phone numbers to JIDs.
+        
+        Any iterable is accepted and consumed once, so tuples and
+        generators work as well as lists.
+        
+        Args:
+            participants: Participant phone numbers or JIDs
+            
+        Returns:
+            List of participant JIDs, without the invalid entries
+            
+        Raises:
+            ValidationError: If no valid participants remain
+        """
+        formatted_participants = []
+        for participant in participants:
+            try:
+                if '@' not in participant:
+                    # Convert phone number to JID
+                    phone = validate_phone_number(participant)
+                    jid = phone_to_jid(phone)
+                else:
+                    jid = participant
+                
+                formatted_participants.append(jid)
+            except ValueError as e:
+                logger.warning(f"Invalid participant {participant}: {e}")
+                # Skip invalid participants
+        
+        if not formatted_participants:
+            raise ValidationError("No valid participants provided")
+        
+        return formatted_participants
+    
+    def create_group(self, subject: str, participants: Iterable[str]) -> Dict[str, Any]:
         """
         Create a new WhatsApp group.
         
@@ -50,28 +86,12 @@ class GroupManager:
         if not subject or not subject.strip():
             raise ValidationError("Group subject cannot be empty")
         
-        if not participants or len(participants) < 1:
+        if not participants:
             raise ValidationError("Group must have at least one participant")
         
         try:
             # Validate and format participants
-            formatted_participants = []
-            for participant in participants:
-                try:
-                    if '@' not in participant:
-                        # Convert phone number to JID
-                        phone = validate_phone_number(participant)
-                        jid = phone_to_jid(phone)
-                    else:
-                        jid = participant
-                    
-                    formatted_participants.append(jid)
-                except ValueError as e:
-                    logger.warning(f"Invalid participant {participant}: {e}")
-                    # Skip invalid participants
-            
-            if not formatted_participants:
-                raise ValidationError("No valid participants provided")
+            formatted_participants = self._format_participants(participants)
             
             # Create group creation message
             create_msg = {
@@ -107,7 +127,7 @@ class GroupManager:
             logger.error(f"Failed to create group: {e}")
             raise GroupError(f"Failed to create group: {str(e)}")
     
-    def add_participants(self, group_id: str, participants: List[str]) -> bool:
+    def add_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Add participants to a group.
         
@@ -130,23 +150,7 @@ class GroupManager:
         
         try:
             # Validate and format participants
-            formatted_participants = []
-            for participant in participants:
-                try:
-                    if '@' not in participant:
-                        # Convert phone number to JID
-                        phone = validate_phone_number(participant)
-                        jid = phone_to_jid(phone)
-                    else:
-                        jid = participant
-                    
-                    formatted_participants.append(jid)
-                except ValueError as e:
-                    logger.warning(f"Invalid participant {participant}: {e}")
-                    # Skip invalid participants
-            
-            if not formatted_participants:
-                raise ValidationError("No valid participants provided")
+            formatted_participants = self._format_participants(participants)
             
             # Create add participants message
             add_msg = {
@@ -156,7 +160,9 @@ class GroupManager:
                 "participants": formatted_participants
             }
             
-            # Send add participants request
+            # Send add participants request. This is one message addressed to
+            # the group; the server notifies the members, so there is no
+            # per-recipient fan-out to encode or compress on our side
             encoded = self.connection.protocol.encode_message(add_msg)
             self.connection.send_message(encoded)
             
@@ -171,7 +177,7 @@ class GroupManager:
             logger.error(f"Failed to add participants: {e}")
             raise GroupError(f"Failed to add participants: {str(e)}")
     
-    def remove_participants(self, group_id: str, participants: List[str]) -> bool:
+    def remove_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Remove participants from a group.
         
@@ -194,23 +200,7 @@ class GroupManager:
         
         try:
             # Validate and format participants
-            formatted_participants = []
-            for participant in participants:
-                try:
-                    if '@' not in participant:
-                        # Convert phone number to JID
-                        phone = validate_phone_number(participant)
-                        jid = phone_to_jid(phone)
-                    else:
-                        jid = participant
-                    
-                    formatted_participants.append(jid)
-                except ValueError as e:
-                    logger.warning(f"Invalid participant {participant}: {e}")
-                    # Skip invalid participants
-            
-            if not formatted_participants:
-                raise ValidationError("No valid participants provided")
+            formatted_participants = self._format_participants(participants)
             
             # Create remove participants message
             remove_msg = {
@@ -370,7 +360,7 @@ class GroupManager:
             logger.error(f"Failed to get group info: {e}")
             raise GroupError(f"Failed to get group info: {str(e)}")
     
-    def promote_participants(self, group_id: str, participants: List[str]) -> bool:
+    def promote_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Promote participants to group admins.
         
@@ -393,23 +383,7 @@ class GroupManager:
         
         try:
             # Validate and format participants
-            formatted_participants = []
-            for participant in participants:
-                try:
-                    if '@' not in participant:
-                        # Convert phone number to JID
-                        phone = validate_phone_number(participant)
-                        jid = phone_to_jid(phone)
-                    else:
-                        jid = participant
-                    
-                    formatted_participants.append(jid)
-                except ValueError as e:
-                    logger.warning(f"Invalid participant {participant}: {e}")
-                    # Skip invalid participants
-            
-            if not formatted_participants:
-                raise ValidationError("No valid participants provided")
+            formatted_participants = self._format_participants(participants)
             
             # Create promote participants message
             promote_msg = {
@@ -434,7 +408,7 @@ class GroupManager:
             logger.error(f"Failed to promote participants: {e}")
             raise GroupError(f"Failed to promote participants: {str(e)}")
     
-    def demote_participants(self, group_id: str, participants: List[str]) -> bool:
+    def demote_participants(self, group_id: str, participants: Iterable[str]) -> bool:
         """
         Demote participants from group admins.
         
@@ -457,23 +431,7 @@ class GroupManager:
         
         try:
             # Validate and format participants
-            formatted_participants = []
-            for participant in participants:
-                try:
-                    if '@' not in participant:
-                        # Convert phone number to JID
-                        phone = validate_phone_number(participant)
-                        jid = phone_to_jid(phone)
-                    else:
-                        jid = participant
-                    
-                    formatted_participants.append(jid)
-                except ValueError as e:
-                    logger.warning(f"Invalid participant {participant}: {e}")
-                    # Skip invalid participants
-            
-            if not formatted_participants:
-                raise ValidationError("No valid participants provided")
+            formatted_participants = self._format_participants(participants)
             
             # Create demote participants message
             demote_msg = {
@@ -5,19 +5,49 @@ This module provides functionality for uploading, downloading, and
 processing media content for WhatsApp messages.
 """
 import os
+import mmap
+import stat
 import hashlib
 import mimetypes
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple, BinaryIO
 
-from nocksup.utils.http_utils import HttpClient
+from nocksup.utils.http_utils import HttpClient, get_shared_http_client
 from nocksup.utils.logger import logger
 from nocksup.exceptions import MediaError
+from nocksup.config import MEDIA_CHUNK_SIZE, FILE_HASH_CACHE_SIZE
 from nocksup.protocols.constants import (
     MEDIA_UPLOAD_URL,
     MEDIA_DOWNLOAD_URL,
     MEDIA_TYPES
 )
 
+def open_media_file(file_path: str) -> BinaryIO:
+    """
+    Open a media file for uploading.
+    
+    Args:
+        file_path: Path to file
+        
+    Returns:
+        File object opened for binary reading
+        
+    Raises:
+        MediaError: If the path is not an existing regular file
+    """
+    try:
+        f = open(file_path, 'rb')
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise MediaError(f"File not found: {file_path}")
+    
+    # Reject directories and devices using the descriptor just opened
+    if not stat.S_ISREG(os.fstat(f.fileno()).st_mode):
+        f.close()
+        raise MediaError(f"File not found: {file_path}")
+    
+    return f
+
 class MediaUploader:
     """
     Handles uploading media for WhatsApp messages.
@@ -30,15 +60,23 @@ class MediaUploader:
         Args:
             http_client: Optional HTTP client instance
         """
-        self.http_client = http_client or HttpClient()
+        self.http_client = http_client or get_shared_http_client()
+        
+        # Recently computed hashes: (device, inode, size, mtime) -> hex digest.
+        # The key changes whenever the file is modified
+        self._hash_cache = OrderedDict()
+        self._hash_cache_lock = threading.Lock()
     
-    def upload(self, file_path: str, media_type: str = None) -> Dict[str, Any]:
+    def upload(self, file_path: str, media_type: str = None,
+               file: BinaryIO = None) -> Dict[str, Any]:
         """
         Upload a file to WhatsApp servers.
         
         Args:
             file_path: Path to file
             media_type: Type of media (auto-detected if not provided)
+            file: The file already opened with open_media_file(); it is
+                  closed when the upload finishes
             
         Returns:
             Dictionary with upload info
@@ -47,45 +85,47 @@ class MediaUploader:
             MediaError: If upload fails
         """
         try:
-            # Check if file exists
-            if not os.path.isfile(file_path):
-                raise MediaError(f"File not found: {file_path}")
-            
-            # Get file size
-            file_size = os.path.getsize(file_path)
-            
-            # Detect media type if not provided
-            if not media_type:
-                media_type = self._detect_media_type(file_path)
-            
-            # Validate media type
-            if media_type not in MEDIA_TYPES.values():
-                logger.warning(f"Unrecognized media type: {media_type}")
-            
-            # Calculate hash for file
-            file_hash = self._calculate_file_hash(file_path)
-            
-            # Get mime type
-            mime_type = self._get_mime_type(file_path)
-            
-            # Prepare upload parameters
-            params = {
-                'hash': file_hash,
-                'type': media_type,
-                'size': file_size,
-                'mime': mime_type
-            }
-            
-            # Get upload URL
-            upload_info = self._request_upload_url(params)
-            
-            # Upload the file
-            upload_url = upload_info.get('url')
-            if not upload_url:
-                raise MediaError("No upload URL received")
-            
-            # Upload file to provided URL
-            with open(file_path, 'rb') as f:
+            # Open the file once; its size, hash and upload body all come
+            # from this descriptor, so the file can't change in between
+            f = file if file is not None else open_media_file(file_path)
+            
+            with f:
+                file_stat = os.fstat(f.fileno())
+                
+                # Get file size
+                file_size = file_stat.st_size
+                
+                # Detect media type if not provided
+                if not media_type:
+                    media_type = self._detect_media_type(file_path)
+                
+                # Validate media type
+                if media_type not in MEDIA_TYPES.values():
+                    logger.warning(f"Unrecognized media type: {media_type}")
+                
+                # Calculate hash for file, or reuse it if unchanged since
+                file_hash = self._get_file_hash(f, file_stat)
+                
+                # Get mime type
+                mime_type = self._get_mime_type(file_path)
+                
+                # Prepare upload parameters
+                params = {
+                    'hash': file_hash,
+                    'type': media_type,
+                    'size': file_size,
+                    'mime': mime_type
+                }
+                
+                # Get upload URL
+                upload_info = self._request_upload_url(params)
+                
+                # Upload the file
+                upload_url = upload_info.get('url')
+                if not upload_url:
+                    raise MediaError("No upload URL received")
+                
+                # Upload file to provided URL
                 self._upload_to_url(upload_url, f, mime_type, file_size)
             
             # Return upload info with additional details
@@ -159,10 +199,11 @@ class MediaUploader:
                 'Content-Length': str(file_size)
             }
             
-            # Upload file
+            # Upload file, streaming it from the file object in blocks
+            # instead of reading the whole file into memory first
             response = self.http_client.post(
                 url,
-                data=file.read(),
+                data=file,
                 headers=headers
             )
             
@@ -249,22 +290,64 @@ class MediaUploader:
         
         return mime_type
     
-    def _calculate_file_hash(self, file_path: str) -> str:
+    def _get_file_hash(self, file: BinaryIO, file_stat: os.stat_result) -> str:
+        """
+        Get the SHA-256 hash for a file, computing it only if not cached.
+        
+        Args:
+            file: File object positioned at the start of the file
+            file_stat: Result of fstat on the file
+            
+        Returns:
+            Hex digest of hash
+        """
+        key = (file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+        
+        with self._hash_cache_lock:
+            file_hash = self._hash_cache.get(key)
+            if file_hash is not None:
+                self._hash_cache.move_to_end(key)
+                return file_hash
+        
+        file_hash = self._calculate_file_hash(file, file_stat.st_size)
+        
+        # Rewind for the upload
+        file.seek(0)
+        
+        with self._hash_cache_lock:
+            self._hash_cache[key] = file_hash
+            if len(self._hash_cache) > FILE_HASH_CACHE_SIZE:
+                self._hash_cache.popitem(last=False)
+        
+        return file_hash
+    
+    def _calculate_file_hash(self, file: BinaryIO, file_size: int) -> str:
         """
         Calculate SHA-256 hash for file.
         
         Args:
-            file_path: Path to file
+            file: File object positioned at the start of the file
+            file_size: Size of file in bytes
             
         Returns:
             Hex digest of hash
         """
         hasher = hashlib.sha256()
         
-        with open(file_path, 'rb') as f:
-            # Read in chunks to handle large files
-            for chunk in iter(lambda: f.read(65536), b''):
-                hasher.update(chunk)
+        # Hash straight from the page cache through a read-only mapping,
+        # without copying the file into Python buffers. Empty files can't
+        # be mapped, and some file systems don't support it
+        if file_size:
+            try:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+                return hasher.hexdigest()
+            except (OSError, ValueError):
+                pass
+        
+        # Read in large chunks to handle large files with few syscalls
+        for chunk in iter(lambda: file.read(MEDIA_CHUNK_SIZE), b''):
+            hasher.update(chunk)
         
         return hasher.hexdigest()
 
@@ -280,7 +363,11 @@ class MediaDownloader:
         Args:
             http_client: Optional HTTP client instance
         """
-        self.http_client = http_client or HttpClient()
+        self.http_client = http_client or get_shared_http_client()
+        
+        # Output directories already created, so bulk downloads into the
+        # same directory don't stat it again for every file
+        self._known_dirs = set()
     
     def download(self, media_url: str, output_path: str, 
                 media_key: str = None) -> str:
@@ -299,16 +386,19 @@ class MediaDownloader:
             MediaError: If download fails
         """
         try:
-            # Make sure output directory exists
+            # Make sure output directory exists (once per directory)
             output_dir = os.path.dirname(output_path)
-            if output_dir and not os.path.exists(output_dir):
+            if output_dir and output_dir not in self._known_dirs:
                 os.makedirs(output_dir, exist_ok=True)
+                self._known_dirs.add(output_dir)
             
             # Download the file
-            logger.info(f"Downloading media from {media_url}")
+            logger.info("Downloading media from %s", media_url)
             success = self.http_client.download_file(media_url, output_path)
             
             if not success:
+                # The directory may have been removed since it was created
+                self._known_dirs.discard(output_dir)
                 raise MediaError("Download failed")
             
             # Decrypt if media key provided (not implemented in demo)
@@ -316,7 +406,7 @@ class MediaDownloader:
                 logger.info("Media key provided, decryption would happen here")
                 # self._decrypt_media(output_path, media_key)
             
-            logger.info(f"Media downloaded to {output_path}")
+            logger.info("Media downloaded to %s", output_path)
             return output_path
             
         except Exception as e:
@@ -360,6 +450,8 @@ class MediaMessage:
     including uploading and downloading.
     """
     
+    __slots__ = ('media_type', 'file_path', 'url', 'caption', 'uploader', 'media_info')
+    
     def __init__(self, media_type: str, file_path: str = None, url: str = None, 
                 caption: str = None, uploader: MediaUploader = None):
         """
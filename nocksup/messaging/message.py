@@ -4,15 +4,17 @@ Message handling for WhatsApp.
 This module provides classes for WhatsApp message handling,
 including message creation, sending, and parsing.
 """
+import functools
 import time
 from enum import Enum
 from typing import Dict, Any, Optional, Union, List
 
 from nocksup.utils.logger import logger
 from nocksup.utils import validate_phone_number, phone_to_jid
-from nocksup.exceptions import MessageError, ValidationError
+from nocksup.exceptions import MessageError, ProtocolError, ValidationError
 from nocksup.protocols.message_protocol import MessageProtocol
 from nocksup.protocols.constants import MESSAGE_TYPES, WHATSAPP_DOMAIN
+from nocksup.config import RECIPIENT_CACHE_SIZE
 
 class MessageType(Enum):
     """Message type enumeration."""
@@ -33,6 +35,66 @@ class MessageType(Enum):
                 return member
         raise ValueError(f"Unknown message type: {value}")
 
+# Message types that carry a media URL
+_MEDIA_MESSAGE_TYPES = frozenset({
+    MessageType.IMAGE, MessageType.VIDEO, MessageType.AUDIO,
+    MessageType.DOCUMENT, MessageType.STICKER
+})
+
+# Fields a location message must provide
+_LOCATION_REQUIRED_FIELDS = frozenset({'latitude', 'longitude'})
+
+@functools.lru_cache(maxsize=RECIPIENT_CACHE_SIZE)
+def _recipient_jid(to: str) -> str:
+    """
+    Resolve a recipient phone number or JID to a JID.
+    
+    Cached, so repeated sends to a recipient skip validation and share
+    one JID string, whose hash Python computes only once.
+    
+    Args:
+        to: Recipient phone number or JID
+        
+    Returns:
+        Recipient JID
+        
+    Raises:
+        ValueError: If the phone number is invalid
+    """
+    # Check if it's already a JID
+    if '@' in to:
+        return to
+    
+    phone = validate_phone_number(to)
+    return phone_to_jid(phone, WHATSAPP_DOMAIN)
+
+def _to_coordinate(value: Any, limit: float, name: str) -> float:
+    """
+    Convert a coordinate to float and check its range.
+    
+    Args:
+        value: Coordinate value
+        limit: Largest allowed absolute value
+        name: Coordinate name for error messages
+        
+    Returns:
+        Coordinate as a float
+        
+    Raises:
+        ValidationError: If the value is not a number or out of range
+    """
+    # Floats, the common case from typed callers, skip the conversion
+    if type(value) is not float:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError(f"Invalid {name}: {value!r}")
+    
+    if not -limit <= value <= limit:
+        raise ValidationError(f"{name.capitalize()} out of range: {value}")
+    
+    return value
+
 class Message:
     """
     WhatsApp message representation.
@@ -41,6 +103,17 @@ class Message:
     for creating, sending, and parsing messages.
     """
     
+    __slots__ = (
+        'type', 'to', 'content', 'media_url', 'caption',
+        'id', 'timestamp', 'from_me', 'status', 'from_jid', 'raw_data'
+    )
+    
+    # Protocol handler shared by all messages; it holds no per-message state
+    protocol = MessageProtocol()
+    
+    # Bound once so sending doesn't look the method up per message
+    _new_message_id = protocol.generate_message_id
+    
     def __init__(self, message_type: Union[MessageType, str], to: str = None, 
                  content: Any = None, media_url: str = None, caption: str = None):
         """
@@ -82,7 +155,6 @@ class Message:
         self.status = 'pending'
         self.from_jid = None
         self.raw_data = None
-        self.protocol = MessageProtocol()
     
     def set_recipient(self, to: str) -> None:
         """
@@ -95,13 +167,7 @@ class Message:
             ValidationError: If recipient is invalid
         """
         try:
-            # Check if it's already a JID
-            if '@' in to:
-                self.to = to
-            else:
-                # Try to validate as phone number
-                phone = validate_phone_number(to)
-                self.to = phone_to_jid(phone, WHATSAPP_DOMAIN)
+            self.to = _recipient_jid(to)
         except ValueError as e:
             raise ValidationError(f"Invalid recipient: {e}")
     
@@ -123,9 +189,7 @@ class Message:
         # Add content based on type
         if self.type == MessageType.TEXT:
             message_dict['content'] = self.content
-        elif self.type in [MessageType.IMAGE, MessageType.VIDEO, 
-                           MessageType.AUDIO, MessageType.DOCUMENT, 
-                           MessageType.STICKER]:
+        elif self.type in _MEDIA_MESSAGE_TYPES:
             message_dict['media_url'] = self.media_url
             message_dict['caption'] = self.caption
             message_dict['media_type'] = self.type.value
@@ -162,6 +226,9 @@ class Message:
         # Validate message
         self._validate()
         
+        # Assign the ID up front so callers can return it
+        self.ensure_id()
+        
         try:
             # Convert to dictionary
             message_dict = self.to_dict()
@@ -171,10 +238,21 @@ class Message:
             
             return encoded
             
-        except Exception as e:
+        except ProtocolError as e:
             logger.error(f"Failed to prepare message: {e}")
             raise MessageError(f"Failed to prepare message: {str(e)}")
     
+    def ensure_id(self) -> str:
+        """
+        Assign a message ID if the message has none yet.
+        
+        Returns:
+            Message ID
+        """
+        if not self.id:
+            self.id = self._new_message_id()
+        return self.id
+    
     def _validate(self) -> None:
         """
         Validate message before sending.
@@ -186,27 +264,29 @@ class Message:
         if not self.to:
             raise ValidationError("No recipient specified")
         
-        # Check content
-        if self.type == MessageType.TEXT and not self.content:
-            raise ValidationError("Text message with no content")
+        # Check content; at most one type-specific branch runs, text first
+        # as the most common case
+        message_type = self.type
+        if message_type is MessageType.TEXT:
+            if not self.content:
+                raise ValidationError("Text message with no content")
         
         # Check media URL for media messages
-        if self.type in [MessageType.IMAGE, MessageType.VIDEO, 
-                         MessageType.AUDIO, MessageType.DOCUMENT,
-                         MessageType.STICKER] and not self.media_url:
-            raise ValidationError(f"{self.type.value} message with no media URL")
+        elif message_type in _MEDIA_MESSAGE_TYPES:
+            if not self.media_url:
+                raise ValidationError(f"{message_type.value} message with no media URL")
         
         # Check location content
-        if self.type == MessageType.LOCATION:
+        elif message_type is MessageType.LOCATION:
             if not isinstance(self.content, dict):
                 raise ValidationError("Location content must be a dictionary")
             
             # Check required location fields
-            if not all(k in self.content for k in ['latitude', 'longitude']):
+            if not _LOCATION_REQUIRED_FIELDS <= self.content.keys():
                 raise ValidationError("Location must have latitude and longitude")
         
         # Check contact content
-        if self.type == MessageType.CONTACT:
+        elif message_type is MessageType.CONTACT:
             if not isinstance(self.content, list) or not self.content:
                 raise ValidationError("Contact content must be a non-empty list")
     
@@ -299,10 +379,13 @@ class Message:
             
         Returns:
             Message object
+            
+        Raises:
+            ValidationError: If a coordinate is not a number or out of range
         """
         location_data = {
-            'latitude': latitude,
-            'longitude': longitude,
+            'latitude': _to_coordinate(latitude, 90.0, 'latitude'),
+            'longitude': _to_coordinate(longitude, 180.0, 'longitude'),
             'name': name,
             'address': address
         }
@@ -4,8 +4,28 @@ WhatsApp protocol implementation.
 This module provides the core protocol implementation for communicating
 with WhatsApp servers, handling message format, encoding, and networking.
 """
+import importlib
 
-from nocksup.protocols.message_protocol import MessageProtocol
-from nocksup.protocols.connection import ConnectionManager
+# Public names and the modules defining them, imported on first access
+_LAZY_IMPORTS = {
+    'MessageProtocol': 'nocksup.protocols.message_protocol',
+    'ConnectionManager': 'nocksup.protocols.connection',
+}
 
 __all__ = ['MessageProtocol', 'ConnectionManager']
+
+def __getattr__(name):
+    """Import public names lazily on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List module attributes including lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -4,7 +4,6 @@ Connection manager for WhatsApp.
 This module handles the WebSocket connection to WhatsApp servers,
 including connection establishment, reconnection, and message handling.
 """
-import json
 import time
 import threading
 import queue
@@ -13,9 +12,12 @@ from typing import Dict, Any, List, Optional, Callable, Union
 import websocket
 
 from nocksup.utils.logger import logger
+from nocksup.utils import json_utils
+from nocksup.utils.ssl_utils import get_shared_ssl_context
 from nocksup.exceptions import ConnectionError
 from nocksup.protocols.constants import (
     WEBSOCKET_URL, 
+    SEND_BATCH_SIZE,
     AUTH_STATES,
     WHATSAPP_WEB_VERSION
 )
@@ -42,7 +44,11 @@ class ConnectionManager:
         """
         self.credentials = credentials
         self.ws = None
-        self.connected = False
+        
+        # Backs the connected property; worker threads wait on it while
+        # disconnected instead of polling
+        self._connected_event = threading.Event()
+        
         self.reconnect_count = 0
         self.reconnect_delay = 5  # seconds
         self.max_reconnect_delay = 60  # seconds
@@ -50,6 +56,10 @@ class ConnectionManager:
         self.state = AUTH_STATES['disconnected']
         self.protocol = MessageProtocol()
         self.message_queue = queue.Queue()
+        
+        # Frames taken from the queue but not yet written; retried before
+        # anything newer so order is kept across failures and reconnects
+        self._pending_batch = []
         self.send_thread = None
         self.recv_thread = None
         self.keepalive_thread = None
@@ -62,6 +72,14 @@ class ConnectionManager:
         
         # Message handlers
         self.message_handlers = {}
+        
+        # Dispatch table for top-level frame types
+        self._type_handlers = {
+            "message": self._handle_chat_message,
+            "receipt": self._handle_receipt,
+            "presence": self._handle_presence,
+            "pong": self._handle_pong
+        }
     
     def connect(self) -> bool:
         """
@@ -85,7 +103,10 @@ class ConnectionManager:
                     'User-Agent': f'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
                                   f'AppleWebKit/537.36 (KHTML, like Gecko) '
                                   f'Chrome/96.0.4664.110 Safari/537.36'
-                }
+                },
+                # Send, keepalive and init paths write from different threads
+                enable_multithread=True,
+                sslopt={'context': get_shared_ssl_context()}
             )
             
             # Initialize connection with credentials if available
@@ -139,6 +160,13 @@ class ConnectionManager:
             logger.error(f"Reconnection failed: {e}")
             return False
     
+    def _reconnect_or_close(self) -> None:
+        """Reconnect after a dropped connection, reporting closure if that fails."""
+        if not self.reconnect():
+            logger.error("Connection lost")
+            if self.on_close_callback:
+                self.on_close_callback()
+    
     def disconnect(self) -> None:
         """
         Disconnect from WhatsApp servers.
@@ -198,36 +226,56 @@ class ConnectionManager:
     
     def _send_thread_func(self) -> None:
         """Thread function for sending queued messages."""
+        # Queue methods used for every message, bound once for the loop
+        get = self.message_queue.get
+        get_nowait = self.message_queue.get_nowait
+        task_done = self.message_queue.task_done
+        
         while not self.stop_threads:
             try:
-                # Get message from queue with timeout
-                try:
-                    message = self.message_queue.get(timeout=1)
-                except queue.Empty:
+                # Wait for the connection; messages stay queued meanwhile
+                if not self._connected_event.wait(1) or not self.ws:
                     continue
                 
-                # Skip if not connected
+                # Retry a batch that failed earlier before taking new messages
+                batch, self._pending_batch = self._pending_batch, []
+                
+                if not batch:
+                    # Get message from queue with timeout
+                    try:
+                        batch = [get(timeout=1)]
+                    except queue.Empty:
+                        continue
+                    
+                    # Drain whatever else is already waiting
+                    while len(batch) < SEND_BATCH_SIZE:
+                        try:
+                            batch.append(get_nowait())
+                        except queue.Empty:
+                            break
+                
+                # Keep the batch for later if the connection went away
                 if not self.connected or not self.ws:
-                    # Put message back in queue
-                    self.message_queue.put(message)
-                    time.sleep(1)
+                    self._pending_batch = batch
                     continue
                 
-                # Send message
+                # Send messages. A failed write is retried whole on the next
+                # connection, since how much of it reached the server is unknown
                 try:
-                    self.ws.send(message)
-                    logger.debug(f"Sent message: {message[:100]}...")
+                    self._send_batch(batch)
+                    logger.debug("Sent %d message(s)", len(batch))
                 except Exception as e:
                     logger.error(f"Error sending message: {e}")
-                    # Put message back in queue
-                    self.message_queue.put(message)
+                    self._pending_batch = batch
                     # Trigger reconnect if needed
                     if self.connected:
                         self.connected = False
-                        threading.Thread(target=self.reconnect, daemon=True).start()
+                        threading.Thread(target=self._reconnect_or_close, daemon=True).start()
+                    continue
                 
-                # Mark task as done
-                self.message_queue.task_done()
+                # Mark tasks as done
+                for _ in batch:
+                    task_done()
                 
                 # Small delay to avoid flooding
                 time.sleep(0.1)
@@ -236,13 +284,53 @@ class ConnectionManager:
                 logger.error(f"Error in send thread: {e}")
                 time.sleep(1)
     
+    def _send_batch(self, messages: List[Union[bytes, str]]) -> None:
+        """
+        Send several messages with a single socket write.
+        
+        Each message keeps its own WebSocket frame, so the server sees the
+        same frames as with individual sends; only the TLS records and TCP
+        segments are shared.
+        
+        Args:
+            messages: Text (str) or binary (bytes) payloads
+        """
+        if len(messages) == 1:
+            message = messages[0]
+            self.ws.send(message, self._frame_opcode(message))
+            return
+        
+        create_frame = websocket.ABNF.create_frame
+        frame_opcode = self._frame_opcode
+        data = b''.join(
+            create_frame(message, frame_opcode(message)).format()
+            for message in messages
+        )
+        
+        with self.ws.lock:
+            self.ws.sock.sendall(data)
+    
+    @staticmethod
+    def _frame_opcode(message: Union[bytes, str]) -> int:
+        """
+        Get the WebSocket opcode for a payload.
+        
+        Args:
+            message: Text (str) or binary (bytes) payload
+            
+        Returns:
+            int: OPCODE_BINARY for bytes/bytearray, OPCODE_TEXT otherwise
+        """
+        if isinstance(message, (bytes, bytearray)):
+            return websocket.ABNF.OPCODE_BINARY
+        return websocket.ABNF.OPCODE_TEXT
+    
     def _recv_thread_func(self) -> None:
         """Thread function for receiving messages."""
         while not self.stop_threads:
             try:
-                # Skip if not connected
-                if not self.connected or not self.ws:
-                    time.sleep(1)
+                # Wait until connected
+                if not self._connected_event.wait(1) or not self.ws:
                     continue
                 
                 # Set timeout for receiving
@@ -252,7 +340,7 @@ class ConnectionManager:
                     # Receive message
                     data = self.ws.recv()
                     if data:
-                        logger.debug(f"Received data: {data[:100]}...")
+                        logger.debug("Received data: %.100s...", data)
                         self._handle_message(data)
                 except websocket.WebSocketTimeoutException:
                     # Timeout is normal, continue
@@ -262,7 +350,7 @@ class ConnectionManager:
                     # Trigger reconnect if needed
                     if self.connected:
                         self.connected = False
-                        threading.Thread(target=self.reconnect, daemon=True).start()
+                        threading.Thread(target=self._reconnect_or_close, daemon=True).start()
                 
             except Exception as e:
                 logger.error(f"Error in receive thread: {e}")
@@ -274,9 +362,8 @@ class ConnectionManager:
         
         while not self.stop_threads:
             try:
-                # Skip if not connected
-                if not self.connected or not self.ws:
-                    time.sleep(1)
+                # Wait until connected
+                if not self._connected_event.wait(1) or not self.ws:
                     continue
                 
                 # Send ping
@@ -305,7 +392,7 @@ class ConnectionManager:
         }
         
         # Send as JSON
-        self.ws.send(json.dumps(init_message))
+        self.ws.send(json_utils.dumps(init_message))
         
         # Update state
         self.state = AUTH_STATES['authenticating']
@@ -321,7 +408,7 @@ class ConnectionManager:
                 }
                 
                 # Send as JSON
-                self.ws.send(json.dumps(ping_message))
+                self.ws.send(json_utils.dumps(ping_message))
                 logger.debug("Sent ping message")
                 
             except Exception as e:
@@ -336,33 +423,30 @@ class ConnectionManager:
         """
         try:
             # Parse the message
-            message = json.loads(data)
-            
-            # Handle different message types
-            if message.get("type") == "message":
-                # Regular message
-                self._handle_chat_message(message)
-            elif message.get("type") == "receipt":
-                # Message receipt (delivered/read)
-                self._handle_receipt(message)
-            elif message.get("type") == "presence":
-                # Presence update
-                self._handle_presence(message)
-            elif message.get("type") == "pong":
-                # Response to ping
-                logger.debug("Received pong")
-            else:
-                # Other message types
-                logger.debug(f"Unhandled message type: {message.get('type')}")
-            
-            # Call message callback if provided
-            if self.on_message_callback:
-                self.on_message_callback(message)
-                
-        except json.JSONDecodeError as e:
+            message = json_utils.loads(data)
+        except json_utils.JSONDecodeError as e:
             logger.error(f"Failed to parse message: {e}")
-        except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            return
+        
+        if not isinstance(message, dict):
+            logger.debug("Ignoring non-object message: %.100s", data)
+            return
+        
+        # Dispatch on message type. Handlers may run user code, so a failing
+        # one is logged without keeping the message from the callback below
+        handler = self._type_handlers.get(message.get("type"))
+        if handler:
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"Error handling message: {e}")
+        else:
+            # Other message types
+            logger.debug("Unhandled message type: %s", message.get('type'))
+        
+        # Call message callback if provided
+        if self.on_message_callback:
+            self.on_message_callback(message)
     
     def _handle_chat_message(self, message: Dict[str, Any]) -> None:
         """
@@ -371,7 +455,7 @@ class ConnectionManager:
         Args:
             message: Chat message
         """
-        logger.info(f"Received message from {message.get('from')}: {message.get('body', '')[:50]}...")
+        logger.info("Received message from %s: %.50s...", message.get('from'), message.get('body', ''))
         
         # Check if there's a specific handler for this message type
         message_type = message.get("subtype", "text")
@@ -387,7 +471,7 @@ class ConnectionManager:
         Args:
             receipt: Receipt message
         """
-        logger.debug(f"Received receipt: {receipt.get('type')} for {receipt.get('id')}")
+        logger.debug("Received receipt: %s for %s", receipt.get('type'), receipt.get('id'))
     
     def _handle_presence(self, presence: Dict[str, Any]) -> None:
         """
@@ -396,30 +480,42 @@ class ConnectionManager:
         Args:
             presence: Presence message
         """
-        logger.debug(f"Received presence update: {presence.get('from')} is {presence.get('status')}")
+        logger.debug("Received presence update: %s is %s", presence.get('from'), presence.get('status'))
+    
+    def _handle_pong(self, pong: Dict[str, Any]) -> None:
+        """
+        Handle response to ping.
+        
+        Args:
+            pong: Pong message
+        """
+        logger.debug("Received pong")
     
     def send_message(self, message: Union[Dict[str, Any], bytes, str]) -> bool:
         """
         Queue a message for sending.
         
+        The call returns immediately. The send thread is the single writer
+        for the connection and coalesces whatever is queued into one
+        socket write, so bursts of sends cost one write per batch.
+        
         Args:
             message: Message to send (dict, bytes, or string)
             
         Returns:
             True if message was queued
         """
-        try:
-            # Convert dict to JSON string if needed
-            if isinstance(message, dict):
-                message = json.dumps(message)
-            
-            # Add to send queue
-            self.message_queue.put(message)
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to queue message: {e}")
-            return False
+        # Convert dict to JSON string if needed
+        if isinstance(message, dict):
+            try:
+                message = json_utils.dumps(message)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Failed to queue message: {e}")
+                return False
+        
+        # Add to send queue (unbounded, so this never blocks or fails)
+        self.message_queue.put(message)
+        return True
     
     def register_handler(self, message_type: str, handler: Callable) -> None:
         """
@@ -432,6 +528,30 @@ class ConnectionManager:
         self.message_handlers[message_type] = handler
         logger.debug(f"Registered handler for message type: {message_type}")
     
+    @property
+    def connected(self) -> bool:
+        """Whether the WebSocket connection is up."""
+        return self._connected_event.is_set()
+    
+    @connected.setter
+    def connected(self, value: bool) -> None:
+        if value:
+            self._connected_event.set()
+        else:
+            self._connected_event.clear()
+    
     def is_connected(self) -> bool:
         """Check if connected to WhatsApp servers."""
         return self.connected and self.ws is not None
+    
+    def wait_until_connected(self, timeout: float = None) -> bool:
+        """
+        Block until the connection is up.
+        
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+            
+        Returns:
+            True if connected, False if the timeout expired
+        """
+        return self._connected_event.wait(timeout)
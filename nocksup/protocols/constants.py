@@ -17,6 +17,7 @@ WHATSAPP_WEBSOCKET_SERVER = 'web.whatsapp.com'
 # Connection constants
 WEBSOCKET_URL = 'wss://web.whatsapp.com/ws/chat'
 ORIGIN_URL = 'https://web.whatsapp.com'
+SEND_BATCH_SIZE = 64  # Max queued frames coalesced into one socket write
 
 # Supported browser capabilities (sent when connecting)
 CLIENT_CAPABILITIES = {
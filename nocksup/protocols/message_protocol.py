@@ -4,14 +4,15 @@ WhatsApp message protocol implementation.
 This module handles the message protocol used by WhatsApp,
 including serialization, deserialization, and message structure.
 """
-import json
 import time
 import random
+import threading
 import base64
 from enum import Enum
 from typing import Dict, Any, List, Optional, Union, Tuple
 
 from nocksup.utils.logger import logger
+from nocksup.utils import json_utils
 from nocksup.exceptions import ProtocolError
 from nocksup.protocols.constants import (
     NODE_TYPES, 
@@ -19,6 +20,14 @@ from nocksup.protocols.constants import (
     WHATSAPP_DOMAIN
 )
 
+# Fields copied from an incoming message node for each content type;
+# one lookup replaces a chain of string comparisons
+_CONTENT_FIELDS = {
+    MESSAGE_TYPES['text']: ('content',),
+    MESSAGE_TYPES['media']: ('media_type', 'url', 'caption', 'filename'),
+    MESSAGE_TYPES['location']: ('latitude', 'longitude', 'name', 'address'),
+}
+
 class MessageFlags(Enum):
     """Enum for message flags."""
     IGNORE = 0
@@ -40,6 +49,17 @@ class MessageProtocol:
         """Initialize the protocol handler."""
         self.message_counter = 0
         self.last_timestamp = int(time.time() * 1000)
+        
+        # Message IDs are generated from several threads (callers, media
+        # worker); the lock keeps counter and timestamp consistent
+        self._id_lock = threading.Lock()
+        
+        # Parser for each incoming node type
+        self._node_parsers = {
+            NODE_TYPES['message']: self._parse_message_node,
+            NODE_TYPES['receipt']: self._parse_receipt_node,
+            NODE_TYPES['presence']: self._parse_presence_node,
+        }
     
     def encode_message(self, message: Dict[str, Any]) -> bytes:
         """
@@ -57,7 +77,8 @@ class MessageProtocol:
         try:
             # Add protocol metadata
             message['timestamp'] = int(time.time() * 1000)
-            message['id'] = self._generate_message_id()
+            if not message.get('id'):
+                message['id'] = self.generate_message_id()
             
             # Protocol buffer serialization for current WhatsApp protocol
             try:
@@ -76,8 +97,8 @@ class MessageProtocol:
                 # Message length as varint
                 length_bytes = self._encode_varint(len(binary_data))
                 
-                # Construct frame
-                frame = bytes([tag]) + length_bytes + binary_data
+                # Construct frame with a single copy of the payload
+                frame = b''.join((bytes((tag,)), length_bytes, binary_data))
                 
                 return frame
                 
@@ -86,7 +107,7 @@ class MessageProtocol:
                 logger.warning("Falling back to JSON/Base64 encoding")
                 
                 # Fallback: Convert to JSON string and base64 encode it
-                json_data = json.dumps(message).encode('utf-8')
+                json_data = json_utils.dumpb(message)
                 encoded = base64.b64encode(json_data)
                 return encoded
                 
@@ -127,7 +148,7 @@ class MessageProtocol:
                     # Actual implementation would convert the message to proper protobuf format
                     # This mock implementation encodes the dict as a binary format similar to 
                     # what WhatsApp expects
-                    encoded = json.dumps(message_dict).encode('utf-8')
+                    encoded = json_utils.dumpb(message_dict)
                     # Add binary wrapper used by WhatsApp's protobuf format
                     header = b'\x08\x01' # Message type and flags
                     return header + encoded
@@ -194,7 +215,7 @@ class MessageProtocol:
                 json_data = base64.b64decode(data)
                 
                 # Parse JSON
-                message = json.loads(json_data.decode('utf-8'))
+                message = json_utils.loads(json_data)
                 
                 return message
                 
@@ -202,7 +223,7 @@ class MessageProtocol:
                 # Try raw JSON as a final fallback
                 try:
                     # Parse as raw JSON
-                    message = json.loads(data.decode('utf-8'))
+                    message = json_utils.loads(data)
                     return message
                 except:
                     # Re-raise the base64 error if JSON also fails
@@ -278,7 +299,7 @@ class MessageProtocol:
                 json_start = data.find(b'{')
                 if json_start >= 0:
                     json_data = data[json_start:]
-                    msg = json.loads(json_data.decode('utf-8'))
+                    msg = json_utils.loads(json_data)
                     msg['message_type'] = 'session'
                     return msg
                 
@@ -505,27 +526,30 @@ class MessageProtocol:
         
         return message
     
-    def _generate_message_id(self) -> str:
+    def generate_message_id(self) -> str:
         """
         Generate a unique message ID.
         
         Returns:
             Message ID
         """
-        # Increment counter and use it as part of ID
-        self.message_counter += 1
-        
         # Get current timestamp
         timestamp = int(time.time() * 1000)
         
-        # Ensure timestamp is at least 1ms greater than last one
-        if timestamp <= self.last_timestamp:
-            timestamp = self.last_timestamp + 1
-        
-        self.last_timestamp = timestamp
+        with self._id_lock:
+            # Increment counter and use it as part of ID
+            self.message_counter += 1
+            counter = self.message_counter
+            
+            # Ensure timestamp is at least 1ms greater than last one
+            if timestamp <= self.last_timestamp:
+                timestamp = self.last_timestamp + 1
+            
+            self.last_timestamp = timestamp
         
         # Generate unique ID with timestamp and counter
-        message_id = f"{timestamp}.{self.message_counter}_{random.randint(1000, 9999)}"
+        # (random() is several times cheaper than randint for the suffix)
+        message_id = f"{timestamp}.{counter}_{1000 + int(random.random() * 9000)}"
         
         return message_id
     
@@ -543,16 +567,13 @@ class MessageProtocol:
             # Decode message
             decoded = self.decode_message(data)
             
-            # Check if it's a message node
-            if decoded.get('type') == NODE_TYPES['message']:
-                return self._parse_message_node(decoded)
-            elif decoded.get('type') == NODE_TYPES['receipt']:
-                return self._parse_receipt_node(decoded)
-            elif decoded.get('type') == NODE_TYPES['presence']:
-                return self._parse_presence_node(decoded)
-            else:
+            # Pick the parser for the node type
+            parser = self._node_parsers.get(decoded.get('type'))
+            if parser is None:
                 # Other node types (not fully implemented in this demo)
                 return decoded
+            
+            return parser(decoded)
                 
         except Exception as e:
             logger.error(f"Failed to parse incoming message: {e}")
@@ -584,20 +605,12 @@ class MessageProtocol:
             message['participant'] = node.get('participant')
         
         # Add content based on type
-        if message['type'] == MESSAGE_TYPES['text']:
-            message['content'] = node.get('content')
-        elif message['type'] == MESSAGE_TYPES['media']:
-            message['media_type'] = node.get('media_type')
-            message['url'] = node.get('url')
-            message['caption'] = node.get('caption')
-            message['filename'] = node.get('filename')
-        elif message['type'] == MESSAGE_TYPES['location']:
-            message['latitude'] = node.get('latitude')
-            message['longitude'] = node.get('longitude')
-            message['name'] = node.get('name')
-            message['address'] = node.get('address')
-        elif message['type'] == MESSAGE_TYPES['contact']:
-            message['contacts'] = node.get('contacts', [])
+        for field in _CONTENT_FIELDS.get(message['type'], ()):
+            message[field] = node.get(field)
+        
+        if message['type'] == MESSAGE_TYPES['contact']:
+            # Copied, so callers may modify it without touching the node
+            message['contacts'] = list(node.get('contacts', ()))
         
         return message
     
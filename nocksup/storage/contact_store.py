@@ -7,6 +7,7 @@ WhatsApp contact information.
 import os
 import json
 import time
+from bisect import bisect_left
 from typing import Dict, Any, Optional, List
 
 from nocksup.utils.logger import logger
@@ -35,6 +36,9 @@ class ContactStore:
         # In-memory cache
         self.contacts_cache = {}
         
+        # Sorted phone numbers for prefix lookups, rebuilt after changes
+        self._sorted_phones = None
+        
         # Contact database file
         self.contacts_file = os.path.join(self.storage_dir, 'contacts.json')
         
@@ -75,17 +79,58 @@ class ContactStore:
             
             # Add to cache
             self.contacts_cache[key] = contact
+            self._sorted_phones = None
             
             # Save to file
             self._save_contacts()
             
-            logger.debug(f"Contact saved: {key}")
+            logger.debug("Contact saved: %s", key)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save contact: {e}")
             raise StorageError(f"Failed to save contact: {str(e)}")
     
+    def add_contacts(self, contacts: List[Dict[str, Any]]) -> bool:
+        """
+        Add or update several contacts with a single write to disk.
+        
+        Args:
+            contacts: List of contact data to save
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            StorageError: If saving fails
+        """
+        try:
+            timestamp = int(time.time())
+            
+            for contact in contacts:
+                # Ensure required fields
+                if 'phone' not in contact and 'jid' not in contact:
+                    raise ValueError("Contact must have either 'phone' or 'jid'")
+                
+                # Extract phone from JID if not provided
+                if 'phone' not in contact:
+                    contact['phone'] = contact['jid'].split('@')[0]
+                
+                contact['last_updated'] = timestamp
+                self.contacts_cache[contact['phone']] = contact
+            
+            self._sorted_phones = None
+            
+            # Save to file once for the whole batch
+            self._save_contacts()
+            
+            logger.debug("Saved %d contacts", len(contacts))
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to save contacts: {e}")
+            raise StorageError(f"Failed to save contacts: {str(e)}")
+    
     def get_contact(self, phone: str) -> Optional[Dict[str, Any]]:
         """
         Get contact by phone number.
@@ -107,10 +152,10 @@ class ContactStore:
             contact = self.contacts_cache.get(phone)
             
             if contact:
-                logger.debug(f"Contact found in cache: {phone}")
+                logger.debug("Contact found in cache: %s", phone)
                 return contact.copy()  # Return a copy to prevent modifications
             else:
-                logger.debug(f"Contact not found: {phone}")
+                logger.debug("Contact not found: %s", phone)
                 return None
                 
         except Exception as e:
@@ -140,10 +185,10 @@ class ContactStore:
             # If phone extraction fails, search in cache
             for contact in self.contacts_cache.values():
                 if contact.get('jid') == jid:
-                    logger.debug(f"Contact found by JID: {jid}")
+                    logger.debug("Contact found by JID: %s", jid)
                     return contact.copy()  # Return a copy to prevent modifications
             
-            logger.debug(f"Contact not found by JID: {jid}")
+            logger.debug("Contact not found by JID: %s", jid)
             return None
             
         except Exception as e:
@@ -174,6 +219,7 @@ class ContactStore:
             
             # Remove from cache
             del self.contacts_cache[phone]
+            self._sorted_phones = None
             
             # Save to file
             self._save_contacts()
@@ -203,6 +249,44 @@ class ContactStore:
             logger.error(f"Failed to get all contacts: {e}")
             raise StorageError(f"Failed to get all contacts: {str(e)}")
     
+    def get_contacts_by_prefix(self, prefix: str) -> List[Dict[str, Any]]:
+        """
+        Get contacts whose phone number starts with a prefix.
+        
+        Uses a sorted index of phone numbers, so a lookup costs a binary
+        search plus the matches instead of a scan of every contact.
+        
+        Args:
+            prefix: Phone number prefix, e.g. a country code ('+' optional)
+            
+        Returns:
+            List of contact data dictionaries, ordered by phone number
+            
+        Raises:
+            StorageError: If retrieval fails
+        """
+        try:
+            prefix = str(prefix).lstrip('+')
+            
+            # Rebuild the index if contacts changed since the last lookup
+            phones = self._sorted_phones
+            if phones is None:
+                phones = self._sorted_phones = sorted(self.contacts_cache)
+            
+            # Matches are contiguous in sorted order, starting at the prefix
+            contacts = []
+            for i in range(bisect_left(phones, prefix), len(phones)):
+                phone = phones[i]
+                if not phone.startswith(prefix):
+                    break
+                contacts.append(self.contacts_cache[phone].copy())
+            
+            return contacts
+            
+        except Exception as e:
+            logger.error(f"Failed to get contacts by prefix: {e}")
+            raise StorageError(f"Failed to get contacts by prefix: {str(e)}")
+    
     def clear_contacts(self) -> bool:
         """
         Clear all contacts.
@@ -216,6 +300,7 @@ class ContactStore:
         try:
             # Clear cache
             self.contacts_cache.clear()
+            self._sorted_phones = None
             
             # Save to file
             self._save_contacts()
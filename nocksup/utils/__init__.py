@@ -1,20 +1,38 @@
 """
 Utility functions for the nocksup library.
 """
+import functools
 import re
-import random
+import secrets
 import string
 import time
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
+
+from nocksup.config import PHONE_CACHE_SIZE
+
+# Characters used in request IDs
+_REQUEST_ID_ALPHABET = string.ascii_uppercase + string.digits
+
+# Matches any non-digit character in a phone number
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# A normalized phone number: country code first, 8 to 15 digits in all
+_VALID_PHONE_RE = re.compile(r'[1-4]\d{7,14}')
 
 def generate_request_id() -> str:
     """Generate a unique request ID for WhatsApp requests."""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=16))
+    # 16 uppercase alphanumeric characters from the CSPRNG (~82 bits)
+    choice = secrets.choice
+    return ''.join(choice(_REQUEST_ID_ALPHABET) for _ in range(16))
 
+@functools.lru_cache(maxsize=PHONE_CACHE_SIZE)
 def validate_phone_number(phone: str) -> str:
     """
     Validate and normalize a phone number.
     
+    Results are cached, since the same numbers are validated again on
+    every contact lookup; invalid numbers raise each time.
+    
     Args:
         phone: Phone number with or without country code
         
@@ -25,7 +43,7 @@ def validate_phone_number(phone: str) -> str:
         ValueError: If phone number is invalid
     """
     # Remove any non-digit characters
-    phone = re.sub(r'\D', '', phone)
+    phone = _NON_DIGIT_RE.sub('', phone)
     
     # Check if it starts with country code
     if not phone.startswith('1') and not phone.startswith('2') and not phone.startswith('3') and not phone.startswith('4'):
@@ -37,12 +55,40 @@ def validate_phone_number(phone: str) -> str:
     
     return phone
 
+def validate_phone_numbers(phones: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Validate and normalize many phone numbers at once.
+    
+    Applies the same rules as validate_phone_number() without raising,
+    so large lists are checked without per-number exception handling.
+    
+    Args:
+        phones: Phone numbers with country code
+        
+    Returns:
+        Tuple of (normalized valid numbers, invalid inputs)
+    """
+    strip = _NON_DIGIT_RE.sub
+    is_valid = _VALID_PHONE_RE.fullmatch
+    
+    valid = []
+    invalid = []
+    for phone in phones:
+        normalized = strip('', phone)
+        if is_valid(normalized):
+            valid.append(normalized)
+        else:
+            invalid.append(phone)
+    
+    return valid, invalid
+
 def jid_to_phone(jid: str) -> str:
     """Extract phone number from WhatsApp JID."""
     if '@' in jid:
         return jid.split('@')[0]
     return jid
 
+@functools.lru_cache(maxsize=PHONE_CACHE_SIZE)
 def phone_to_jid(phone: str, domain: str = 's.whatsapp.net') -> str:
     """Convert phone number to WhatsApp JID."""
     phone = validate_phone_number(phone)
@@ -19,6 +19,7 @@ from cryptography.hazmat.backends import default_backend
 
 from nocksup.exceptions import EncryptionError
 from nocksup.utils.logger import logger
+from nocksup.utils.keypool import generate_key_pair, get_key_pool
 
 class EncryptionManager:
     """Manages encryption operations for WhatsApp communication."""
@@ -34,6 +35,9 @@ class EncryptionManager:
         self._identity_key_pair = self._load_or_generate_identity_key(identity_key)
         self._sessions = {}  # Map of JID -> encryption session
         
+        # Start filling the key pool so generate_keys() doesn't wait on key generation
+        get_key_pool().start()
+        
     def _load_or_generate_identity_key(self, identity_key: bytes = None) -> Tuple[bytes, bytes]:
         """
         Load existing or generate new identity key pair.
@@ -47,21 +51,7 @@ class EncryptionManager:
             pass
         
         # Generate new key pair
-        private_key = x25519.X25519PrivateKey.generate()
-        public_key = private_key.public_key()
-        
-        # Get raw bytes
-        private_bytes = private_key.private_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PrivateFormat.Raw,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        public_bytes = public_key.public_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PublicFormat.Raw
-        )
-        
-        return (private_bytes, public_bytes)
+        return generate_key_pair()
     
     def generate_keys(self) -> Dict[str, bytes]:
         """
@@ -70,20 +60,8 @@ class EncryptionManager:
         Returns:
             Dictionary with the required keys
         """
-        # Generate ephemeral key pair
-        ephemeral_private = x25519.X25519PrivateKey.generate()
-        ephemeral_public = ephemeral_private.public_key()
-        
-        # Get raw bytes
-        ephemeral_private_bytes = ephemeral_private.private_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PrivateFormat.Raw,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        ephemeral_public_bytes = ephemeral_public.public_bytes(
-            encoding=serialization.Encoding.Raw,
-            format=serialization.PublicFormat.Raw
-        )
+        # Take a pre-generated ephemeral key pair from the shared pool
+        ephemeral_private_bytes, ephemeral_public_bytes = get_key_pool().get()
         
         return {
             'identity_private': self._identity_key_pair[0],
@@ -276,6 +254,3 @@ class EncryptionManager:
 def generate_random_bytes(length: int) -> bytes:
     """Generate cryptographically secure random bytes."""
     return os.urandom(length)
-
-# Missing import added here to resolve reference before assignment
-from cryptography.hazmat.primitives import serialization
@@ -2,16 +2,90 @@
 HTTP utilities for WhatsApp API communication.
 """
 import json
+import ssl
+import threading
 import time
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Union, BinaryIO
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPSConnectionPool
 from urllib3.util.retry import Retry
 
 from nocksup.exceptions import ConnectionError
 from nocksup.utils.logger import logger
-from nocksup.config import USER_AGENT, SOCKET_TIMEOUT, MAX_RETRIES, RETRY_DELAY
+from nocksup.config import (
+    USER_AGENT,
+    SOCKET_TIMEOUT,
+    MAX_RETRIES,
+    RETRY_DELAY,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    TLS_SESSION_RESUMPTION,
+    MEDIA_CHUNK_SIZE
+)
+
+class _SessionCachingSSLContext(ssl.SSLContext):
+    """
+    SSL context that resumes previous TLS sessions.
+    
+    Sessions are cached per (host, port) and offered to the server on the
+    next handshake, which then skips the full key exchange.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._tls_sessions = {}
+    
+    def remember_session(self, host: str, port: int, session: ssl.SSLSession) -> None:
+        """Store the TLS session of a connection to host:port."""
+        if session is not None:
+            self._tls_sessions[(host, port)] = session
+    
+    def wrap_socket(self, sock, *args, server_hostname: str = None,
+                    session: ssl.SSLSession = None, **kwargs):
+        """Wrap a socket, resuming a cached session for the peer if available."""
+        if session is None and server_hostname:
+            try:
+                key = (server_hostname, sock.getpeername()[1])
+                session = self._tls_sessions.get(key)
+            except OSError:
+                session = None
+        
+        return super().wrap_socket(
+            sock, *args,
+            server_hostname=server_hostname,
+            session=session,
+            **kwargs
+        )
+
+class _SessionCachingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS pool that records the TLS session of connections it releases."""
+    
+    def _put_conn(self, conn) -> None:
+        ssl_context = self.conn_kw.get('ssl_context')
+        sock = getattr(conn, 'sock', None)
+        
+        # The session ticket is only complete once a response has been
+        # read, so capture it when the connection goes back to the pool
+        if isinstance(ssl_context, _SessionCachingSSLContext) and isinstance(sock, ssl.SSLSocket):
+            ssl_context.remember_session(self.host, self.port, sock.session)
+        
+        super()._put_conn(conn)
+
+class _TLSResumptionAdapter(HTTPAdapter):
+    """HTTP adapter whose HTTPS pools resume cached TLS sessions."""
+    
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        ssl_context = _SessionCachingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_context.load_default_certs()
+        kwargs['ssl_context'] = ssl_context
+        
+        super().init_poolmanager(*args, **kwargs)
+        
+        self.poolmanager.pool_classes_by_scheme = dict(
+            self.poolmanager.pool_classes_by_scheme,
+            https=_SessionCachingHTTPSConnectionPool
+        )
 
 class HttpClient:
     """HTTP client for WhatsApp API communication."""
@@ -39,6 +113,10 @@ class HttpClient:
         """
         Create a requests session with retry capability.
         
+        The session keeps a pool of keep-alive connections per host so
+        consecutive requests to the same WhatsApp endpoint reuse the
+        established TCP/TLS connection.
+        
         Returns:
             Configured requests.Session object
         """
@@ -52,7 +130,14 @@ class HttpClient:
             allowed_methods=["GET", "POST"]
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Resume TLS sessions on reconnect if enabled (NOCKSUP_TLS_RESUME=1)
+        adapter_class = _TLSResumptionAdapter if TLS_SESSION_RESUMPTION else HTTPAdapter
+        
+        adapter = adapter_class(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=retry_strategy
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -94,7 +179,7 @@ class HttpClient:
             logger.error(f"GET request failed: {e}")
             raise ConnectionError(f"Failed to connect to {url}: {str(e)}")
     
-    def post(self, url: str, data: Optional[Union[Dict[str, Any], bytes]] = None,
+    def post(self, url: str, data: Optional[Union[Dict[str, Any], bytes, BinaryIO]] = None,
              json_data: Optional[Dict[str, Any]] = None,
              headers: Dict[str, str] = None) -> Dict[str, Any]:
         """
@@ -102,7 +187,7 @@ class HttpClient:
         
         Args:
             url: URL to request
-            data: Form data or raw bytes
+            data: Form data, raw bytes, or a file object to stream
             json_data: JSON data (will be serialized)
             headers: Additional headers
             
@@ -174,7 +259,7 @@ class HttpClient:
             response.raise_for_status()
             
             with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=MEDIA_CHUNK_SIZE):
                     f.write(chunk)
             
             return True
@@ -185,3 +270,27 @@ class HttpClient:
     def close(self) -> None:
         """Close the HTTP session."""
         self.session.close()
+
+# Process-wide client shared by components that aren't given one
+_shared_http_client = None
+_shared_http_client_lock = threading.Lock()
+
+def get_shared_http_client() -> HttpClient:
+    """
+    Get the process-wide shared HTTP client.
+    
+    The client is created on first use. Sharing it lets registration,
+    verification, login and media requests reuse the same keep-alive
+    connection pool instead of each opening new TLS connections.
+    
+    Returns:
+        Shared HttpClient instance
+    """
+    global _shared_http_client
+    
+    if _shared_http_client is None:
+        with _shared_http_client_lock:
+            if _shared_http_client is None:
+                _shared_http_client = HttpClient()
+    
+    return _shared_http_client
@@ -0,0 +1,123 @@
+"""
+Pool of pre-generated X25519 key pairs.
+
+Key generation is the most expensive step of an authentication attempt.
+The pool keeps a few key pairs ready, refilled on a background thread,
+so callers on the auth path can take one without waiting.
+"""
+import os
+import queue
+import threading
+from typing import Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import x25519
+
+from nocksup.config import KEY_POOL_SIZE
+
+def generate_key_pair() -> Tuple[bytes, bytes]:
+    """
+    Generate a new X25519 key pair.
+    
+    Returns:
+        Tuple of (private_key, public_key) raw bytes
+    """
+    private_key = x25519.X25519PrivateKey.generate()
+    
+    private_bytes = private_key.private_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PrivateFormat.Raw,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    public_bytes = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw
+    )
+    
+    return (private_bytes, public_bytes)
+
+class KeyPool:
+    """
+    Pool of single-use X25519 key pairs.
+    
+    A daemon thread keeps the pool filled up to its size. Each key pair is
+    handed out once; if the pool is empty the caller generates one inline.
+    """
+    
+    def __init__(self, size: int = KEY_POOL_SIZE):
+        """
+        Initialize the key pool.
+        
+        Args:
+            size: Number of key pairs to keep ready
+        """
+        self.size = size
+        self._keys = queue.Queue(maxsize=size)
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Start the background refill thread if it isn't running."""
+        if self._thread is not None:
+            return
+        
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._fill, daemon=True)
+                self._thread.start()
+    
+    def get(self) -> Tuple[bytes, bytes]:
+        """
+        Take a key pair from the pool.
+        
+        Returns:
+            Tuple of (private_key, public_key) raw bytes
+        """
+        self.start()
+        
+        try:
+            return self._keys.get_nowait()
+        except queue.Empty:
+            return generate_key_pair()
+    
+    def _fill(self) -> None:
+        """Thread function keeping the pool full."""
+        while True:
+            # Blocks while the pool is full
+            self._keys.put(generate_key_pair())
+
+# Process-wide pool shared by all encryption managers
+_key_pool = None
+_key_pool_lock = threading.Lock()
+
+def get_key_pool() -> KeyPool:
+    """
+    Get the process-wide key pool, creating it on first use.
+    
+    Returns:
+        Shared KeyPool instance
+    """
+    global _key_pool
+    
+    if _key_pool is None:
+        with _key_pool_lock:
+            if _key_pool is None:
+                _key_pool = KeyPool()
+    
+    return _key_pool
+
+def _reset_key_pool_after_fork() -> None:
+    """
+    Drop the inherited key pool in a forked child.
+    
+    The child must not hand out the parent's queued private keys, and
+    the parent's refill thread does not exist in the child; a new pool
+    is created on the next get_key_pool() call.
+    """
+    global _key_pool, _key_pool_lock
+    
+    _key_pool = None
+    _key_pool_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_key_pool_after_fork)
@@ -0,0 +1,41 @@
+"""
+TLS helpers for the nocksup library.
+
+Building an SSL context loads the system CA bundle, which is slow and
+holds a copy of every certificate in memory. All WebSocket connections
+in the process share one client context instead of building their own.
+"""
+import os
+import ssl
+import threading
+
+# Process-wide TLS client context shared by all WebSocket connections
+_shared_ssl_context = None
+_shared_ssl_context_lock = threading.Lock()
+
+def get_shared_ssl_context() -> ssl.SSLContext:
+    """
+    Get the process-wide TLS client context, creating it on first use.
+    
+    The context verifies server certificates and host names against
+    the system CA store, or against WEBSOCKET_CLIENT_CA_BUNDLE when set,
+    as websocket-client does for the contexts it builds itself.
+    
+    Returns:
+        Shared SSLContext instance
+    """
+    global _shared_ssl_context
+    
+    if _shared_ssl_context is None:
+        with _shared_ssl_context_lock:
+            if _shared_ssl_context is None:
+                ca_bundle = os.environ.get('WEBSOCKET_CLIENT_CA_BUNDLE')
+                if ca_bundle and os.path.isfile(ca_bundle):
+                    context = ssl.create_default_context(cafile=ca_bundle)
+                elif ca_bundle and os.path.isdir(ca_bundle):
+                    context = ssl.create_default_context(capath=ca_bundle)
+                else:
+                    context = ssl.create_default_context()
+                _shared_ssl_context = context
+    
+    return _shared_ssl_context
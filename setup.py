@@ -1,8 +1,14 @@
+import re
+
 from setuptools import setup, find_packages
 
+# Single source of truth for the version: nocksup/__init__.py
+with open("nocksup/__init__.py") as f:
+    version = re.search(r"^__version__ = ['\"]([^'\"]+)['\"]", f.read(), re.M).group(1)
+
 setup(
     name="nocksup",
-    version="0.2.0",
+    version=version,
     packages=find_packages(),
     install_requires=[
         "cryptography",
@@ -10,6 +16,9 @@ setup(
         "websocket-client",
         "protobuf",
     ],
+    extras_require={
+        "fast": ["orjson"],
+    },
     author="gyovannyvpn123",
     author_email="mdanut159@gmail.com",
     description="A Python library for WhatsApp communication compatible with current protocols.",
@@ -21,5 +30,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
 )
\ No newline at end of file